@@ -0,0 +1,86 @@
+import itertools
+import logging
+import threading
+
+from settings import BACKLOG_LIMIT
+
+PRIORITY_STATUS = 0
+PRIORITY_RECOVERY = 1
+PRIORITY_ERROR = 2
+
+
+class NotificationBacklog:
+    """Ограниченная очередь уведомлений с классами приоритета.
+
+    Сначала отдаются смены статусов, затем уведомления о восстановлении,
+    затем ошибки. Новое уведомление с тем же ключом в том же чате и
+    классе заменяет устаревшее. При переполнении отбрасывается самое
+    старое уведомление наименее важного класса.
+    """
+
+    def __init__(self, limit=BACKLOG_LIMIT):
+        self._limit = limit
+        self._items = {}
+        self._keys = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _remove(self, seq):
+        priority, chat_id, text, key = self._items.pop(seq)
+        if key is not None:
+            self._keys.pop((chat_id, priority, key), None)
+
+    def _shed(self, priority):
+        """Освобождает место под уведомление с приоритетом `priority`."""
+        victim = max(
+            self._items, key=lambda seq: (self._items[seq][0], -seq)
+        )
+        victim_priority, _, text, _ = self._items[victim]
+        if victim_priority < priority:
+            return False
+
+        self._remove(victim)
+        logging.warning(f'Очередь уведомлений переполнена, '
+                        f'отброшено: `{text}`')
+        return True
+
+    def push(self, chat_id, text, priority=PRIORITY_ERROR, key=None):
+        """Ставит уведомление в очередь; возвращает False, если отброшено."""
+        with self._lock:
+            if key is not None:
+                superseded = self._keys.get((chat_id, priority, key))
+                if superseded is not None:
+                    self._remove(superseded)
+
+            if len(self._items) >= self._limit and not self._shed(priority):
+                logging.warning(f'Очередь уведомлений переполнена, '
+                                f'отброшено: `{text}`')
+                return False
+
+            seq = next(self._sequence)
+            self._items[seq] = (priority, chat_id, text, key)
+            if key is not None:
+                self._keys[chat_id, priority, key] = seq
+            return True
+
+    def pending(self):
+        """Возвращает пары (chat_id, text) в порядке приоритета и очереди."""
+        with self._lock:
+            order = sorted(
+                self._items, key=lambda seq: (self._items[seq][0], seq)
+            )
+            return [self._items[seq][1:3] for seq in order]
+
+    def discard(self, messages):
+        """Удаляет из очереди доставленные пары (chat_id, text)."""
+        messages = set(messages)
+        with self._lock:
+            delivered = [
+                seq for seq, item in self._items.items()
+                if item[1:3] in messages
+            ]
+            for seq in delivered:
+                self._remove(seq)
@@ -0,0 +1,125 @@
+"""Минимальная замена pytest-benchmark для офлайн-замеров.
+
+Запуск из корня проекта:
+
+    python -m pytest benchmarks --bench-save=baseline
+    python -m pytest benchmarks --bench-compare=baseline
+"""
+import json
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from tracing import count_allocations
+
+BASELINES_DIR = Path(__file__).parent / '.baselines'
+RESULTS = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bench', 'офлайн-замеры производительности')
+    group.addoption('--bench-min-time', type=float, default=0.2,
+                    help='минимальное время замера одного теста, секунд')
+    group.addoption('--bench-save', metavar='NAME',
+                    help='сохранить результаты как базовые под именем NAME')
+    group.addoption('--bench-compare', metavar='NAME',
+                    help='сравнить результаты с базовыми NAME')
+
+
+class Benchmark:
+    """Замеряет время, выделения и пиковую память вызова функции.
+
+    Выделения - блоки, созданные вызовом и живые при его завершении,
+    включая возвращенный результат; временные объекты видны только
+    в пиковой памяти.
+    """
+
+    def __init__(self, name, min_time):
+        self.name = name
+        self.min_time = min_time
+        self.items = 1
+
+    def __call__(self, func, *args, **kwargs):
+        result = func(*args, **kwargs)
+
+        rounds, elapsed = 0, 0.0
+        started = time.perf_counter()
+        while elapsed < self.min_time:
+            func(*args, **kwargs)
+            rounds += 1
+            elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        measured = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        del measured
+        allocated_blocks, allocated_bytes = count_allocations(before, after)
+
+        ns_per_op = elapsed / rounds * 1e9
+        RESULTS[self.name] = {
+            'ns_per_op': ns_per_op,
+            'ns_per_item': ns_per_op / self.items,
+            'rounds': rounds,
+            'allocated_blocks': allocated_blocks,
+            'allocated_bytes': allocated_bytes,
+            'peak_bytes': peak,
+        }
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    logging.disable(logging.CRITICAL)
+    yield Benchmark(
+        request.node.name, request.config.getoption('--bench-min-time')
+    )
+    logging.disable(logging.NOTSET)
+
+
+def format_delta(value, baseline):
+    if not baseline:
+        return ''
+    return f'{(value - baseline) / baseline:+.1%}'
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not RESULTS:
+        return
+
+    baseline = {}
+    compare = config.getoption('--bench-compare')
+    if compare:
+        path = BASELINES_DIR / f'{compare}.json'
+        if path.exists():
+            baseline = json.loads(path.read_text(encoding='utf-8'))
+        else:
+            terminalreporter.write_line(f'Нет базовых результатов: {path}')
+
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(
+        f'{"name":<48}{"ns/op":>14}{"ns/item":>10}{"blocks":>9}'
+        f'{"peak, KiB":>11}{"vs base":>9}'
+    )
+    for name, result in RESULTS.items():
+        base = baseline.get(name, {}).get('ns_per_op')
+        terminalreporter.write_line(
+            f'{name:<48}{result["ns_per_op"]:>14.0f}'
+            f'{result["ns_per_item"]:>10.0f}'
+            f'{result["allocated_blocks"]:>9}'
+            f'{result["peak_bytes"] / 1024:>11.1f}'
+            f'{format_delta(result["ns_per_op"], base):>9}'
+        )
+
+    save = config.getoption('--bench-save')
+    if save:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        path = BASELINES_DIR / f'{save}.json'
+        path.write_text(json.dumps(RESULTS, indent=2), encoding='utf-8')
+        terminalreporter.write_line(f'Результаты сохранены: {path}')
@@ -0,0 +1,92 @@
+"""Сравнение `telegram.Bot` и `TelegramClient` на локальной заглушке API.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.telegram_client [количество_сообщений]
+"""
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import telegram
+
+from telegram_client import TelegramClient
+
+TOKEN = '1234:benchmark'
+CHAT_ID = 12345
+MESSAGES = 500
+SEND_RESULT = json.dumps({
+    'ok': True,
+    'result': {
+        'message_id': 1,
+        'date': 0,
+        'chat': {'id': CHAT_ID, 'type': 'private'},
+        'text': 'benchmark',
+    },
+}).encode()
+
+
+class StubBotAPIHandler(BaseHTTPRequestHandler):
+    """Отвечает успехом на любой запрос к Bot API."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(SEND_RESULT)))
+        self.end_headers()
+        self.wfile.write(SEND_RESULT)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(factory, messages):
+    """Возвращает память клиента после первой отправки и время на отправку.
+
+    Первый клиент создается до замера, чтобы ленивые кэши библиотек
+    не попадали в память измеряемого экземпляра.
+    """
+    factory().send_message(CHAT_ID, 'warmup')
+
+    tracemalloc.start()
+    client = factory()
+    client.send_message(CHAT_ID, 'warmup')
+    memory, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for i in range(messages):
+        client.send_message(CHAT_ID, f'message {i}')
+    elapsed = time.perf_counter() - started
+
+    return memory, peak, elapsed / messages
+
+
+def main(messages=MESSAGES):
+    """Запускает заглушку API и печатает результаты обоих клиентов."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubBotAPIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}/bot'
+
+    clients = {
+        'telegram.Bot': lambda: telegram.Bot(TOKEN, base_url=base_url),
+        'TelegramClient': lambda: TelegramClient(TOKEN, base_url=base_url),
+    }
+    print(f'{"client":<16}{"memory, KiB":>14}{"peak, KiB":>12}{"us/send":>10}')
+    for name, factory in clients.items():
+        memory, peak, per_send = measure(factory, messages)
+        print(f'{name:<16}{memory / 1024:>14.1f}{peak / 1024:>12.1f}'
+              f'{per_send * 1e6:>10.1f}')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else MESSAGES)
@@ -0,0 +1,80 @@
+import pytest
+
+from backlog import NotificationBacklog
+from exceptions import APIResponseError
+from homework import (check_response, diff_status, get_hw_date_update,
+                      queue_update)
+from settings import HOMEWORK_STATUSES
+from subscriptions import TokenUpdate
+
+SIZES = [1, 100, 10_000, 100_000]
+STATUSES = list(HOMEWORK_STATUSES)
+
+
+def make_response(size):
+    return {
+        'homeworks': [
+            {
+                'id': i,
+                'homework_name': f'student__hw{i:06d}.zip',
+                'status': STATUSES[i % len(STATUSES)],
+                'reviewer_comment': 'Всё нравится',
+                'date_updated': '2022-02-13T14:40:57Z',
+                'lesson_name': f'Спринт {i % 20}',
+            }
+            for i in range(size)
+        ],
+        'current_date': 1644763257,
+    }
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}hw')
+def response(request, benchmark):
+    benchmark.items = request.param
+    return make_response(request.param)
+
+
+def parse_all(homeworks, states):
+    return [diff_status(homework, states) for homework in homeworks]
+
+
+def test_check_response(benchmark, response):
+    benchmark(check_response, response)
+
+
+def test_parse_status_changed(benchmark, response):
+    homeworks = response['homeworks']
+    messages = benchmark(lambda: parse_all(homeworks, {}))
+    assert all(messages)
+
+
+def test_parse_status_unchanged(benchmark, response):
+    homeworks = response['homeworks']
+    states = {}
+    parse_all(homeworks, states)
+    messages = benchmark(parse_all, homeworks, states)
+    assert not any(messages)
+
+
+def test_get_hw_date_update(benchmark, response):
+    homeworks = response['homeworks']
+    benchmark(lambda: [get_hw_date_update(homework) for homework in homeworks])
+
+
+@pytest.mark.parametrize('chats', SIZES, ids=lambda size: f'{size}chats')
+def test_error_dedup(benchmark, chats):
+    benchmark.items = chats
+    error = APIResponseError('Неожиданный статус ответа: <Response [500]>')
+    update = TokenUpdate('token', tuple(range(chats)), (), error)
+    sent_errors = {
+        (chat_id, f'Ошибка ответа от сервиса: {error}')
+        for chat_id in range(0, chats, 2)
+    }
+
+    def dedup():
+        return queue_update(
+            NotificationBacklog(chats + 1), update, sent_errors
+        )
+
+    queued = benchmark(dedup)
+    assert len(queued) == chats // 2
@@ -0,0 +1,174 @@
+import configparser
+import os
+import re
+from dataclasses import MISSING, dataclass, field, fields
+
+from exceptions import LoadEnvironmentError
+from settings import (API_TIMEOUT, BACKLOG_LIMIT, DEFAULT_BOT_BACKEND,
+                      DELIVERY_BACKOFF, DELIVERY_MAX_BACKOFF,
+                      DELIVERY_MAX_WORKERS, FETCH_MAX_PER_HOST,
+                      FETCH_MAX_PER_TOKEN, FETCH_MAX_WORKERS, LOCALE,
+                      PARSE_MODE, RETRY_TIME, SCHEDULER_TICK,
+                      STATE_COLD_PATH, STATE_MEMORY_BUDGET, STREAM_CHUNK_SIZE,
+                      STREAM_RESPONSES, TELEGRAM_POOL_SIZE, TELEGRAM_TIMEOUT)
+
+CONFIG_SECTION = 'homework_bot'
+
+
+CHAT_ID_PATTERN = r'-?\d+|@\w+'
+
+
+def setting(default=MISSING, minimum=None, choices=None, pattern=None,
+            converter=None):
+    """Описывает параметр настроек и правила его проверки."""
+    return field(default=default, metadata={
+        'minimum': minimum, 'choices': choices, 'pattern': pattern,
+        'converter': converter,
+    })
+
+
+def boolean(raw):
+    """Разбирает логическое значение параметра."""
+    value = str(raw).strip().lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError('ожидается true или false')
+
+
+def chat_ids(raw):
+    """Разбирает список идентификаторов чатов через запятую."""
+    ids = tuple(filter(None, (chat_id.strip() for chat_id in raw.split(','))))
+    for chat_id in ids:
+        if not re.fullmatch(CHAT_ID_PATTERN, chat_id):
+            raise ValueError('неверный формат')
+    return ids
+
+
+@dataclass(frozen=True)
+class Config:
+    """Проверенные настройки бота, загружаемые один раз при запуске.
+
+    Значения берутся из необязательного INI-файла (секция
+    `homework_bot`, путь в `BOT_CONFIG`), затем из переменных окружения
+    и `.env` с именами параметров в верхнем регистре.
+    """
+
+    practicum_token: str = setting()
+    telegram_token: str = setting(pattern=r'\d+:[\w-]+')
+    telegram_chat_id: str = setting(pattern=CHAT_ID_PATTERN)
+    telegram_extra_chat_ids: tuple = setting((), converter=chat_ids)
+    bot_backend: str = setting(
+        DEFAULT_BOT_BACKEND, choices=('telegram', 'light')
+    )
+    telegram_pool_size: int = setting(TELEGRAM_POOL_SIZE, minimum=1)
+    telegram_timeout: float = setting(TELEGRAM_TIMEOUT, minimum=0.1)
+    retry_time: int = setting(RETRY_TIME, minimum=1)
+    api_timeout: float = setting(API_TIMEOUT, minimum=0.1)
+    stream_responses: bool = setting(STREAM_RESPONSES, converter=boolean)
+    stream_chunk_size: int = setting(STREAM_CHUNK_SIZE, minimum=1)
+    scheduler_tick: float = setting(SCHEDULER_TICK, minimum=0.01)
+    fetch_max_workers: int = setting(FETCH_MAX_WORKERS, minimum=1)
+    fetch_max_per_host: int = setting(FETCH_MAX_PER_HOST, minimum=1)
+    fetch_max_per_token: int = setting(FETCH_MAX_PER_TOKEN, minimum=1)
+    delivery_max_workers: int = setting(DELIVERY_MAX_WORKERS, minimum=1)
+    delivery_backoff: float = setting(DELIVERY_BACKOFF, minimum=0.1)
+    delivery_max_backoff: float = setting(DELIVERY_MAX_BACKOFF, minimum=0)
+    backlog_limit: int = setting(BACKLOG_LIMIT, minimum=1)
+    state_memory_budget: int = setting(STATE_MEMORY_BUDGET, minimum=0)
+    state_cold_path: str = setting(STATE_COLD_PATH)
+    locale: str = setting(LOCALE, choices=('ru', 'en'))
+    parse_mode: str = setting(PARSE_MODE, choices=('HTML', 'MarkdownV2'))
+    trace_path: str = setting(None)
+
+
+def read_config_file(path):
+    """Читает параметры из секции `homework_bot` INI-файла.
+
+    Значения берутся как есть, без подстановок `%(...)s`.
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        if not parser.read(path, encoding='utf-8'):
+            raise LoadEnvironmentError(f'Не найден файл настроек: {path}')
+        if not parser.has_section(CONFIG_SECTION):
+            return {}
+        return dict(parser[CONFIG_SECTION])
+    except configparser.Error as e:
+        raise LoadEnvironmentError(
+            f'Ошибка в файле настроек {path}: {e}'
+        ) from e
+
+
+def convert_setting(config_field, raw):
+    """Приводит значение к типу параметра и проверяет его ограничения."""
+    rules = config_field.metadata
+    value = (rules['converter'] or config_field.type)(raw)
+    if rules['minimum'] is not None and value < rules['minimum']:
+        raise ValueError(f'должно быть не меньше {rules["minimum"]}')
+    if rules['choices'] is not None and value not in rules['choices']:
+        raise ValueError(f'допустимые значения: {rules["choices"]}')
+    if rules['pattern'] is not None and not re.fullmatch(
+        rules['pattern'], value
+    ):
+        raise ValueError('неверный формат')
+    return value
+
+
+def check_related(values):
+    """Проверяет согласованность связанных параметров."""
+    errors = []
+    if values['delivery_backoff'] > values['delivery_max_backoff']:
+        errors.append(
+            'DELIVERY_BACKOFF: должно быть не больше DELIVERY_MAX_BACKOFF'
+        )
+    if (values['bot_backend'] == 'light'
+            and values['delivery_max_workers'] > values['telegram_pool_size']):
+        errors.append(
+            'DELIVERY_MAX_WORKERS: должно быть не больше TELEGRAM_POOL_SIZE, '
+            'иначе лишние соединения пула будут закрываться'
+        )
+    return errors
+
+
+def load_config(environ=None, path=None):
+    """Собирает и проверяет настройки, возвращает неизменяемый Config.
+
+    Все ошибки проверки собираются в одно исключение LoadEnvironmentError.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get('BOT_CONFIG')
+    raw_values = read_config_file(path) if path else {}
+    names = {config_field.name for config_field in fields(Config)}
+    errors = [
+        f'{name}: неизвестный параметр в файле настроек'
+        for name in sorted(set(raw_values) - names)
+    ]
+    for config_field in fields(Config):
+        value = environ.get(config_field.name.upper())
+        if value:
+            raw_values[config_field.name] = value
+
+    values = {}
+    for config_field in fields(Config):
+        name = config_field.name
+        raw = raw_values.get(name) or None
+        if raw is None:
+            if config_field.default is MISSING:
+                errors.append(f'{name.upper()}: не задан')
+            values[name] = config_field.default
+            continue
+        try:
+            values[name] = convert_setting(config_field, raw)
+        except ValueError as e:
+            errors.append(f'{name.upper()}: {e}')
+
+    if not errors:
+        errors = check_related(values)
+    if errors:
+        raise LoadEnvironmentError(
+            'Ошибка загрузки настроек: ' + '; '.join(errors)
+        )
+
+    return Config(**values)
@@ -0,0 +1,118 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from exceptions import SendMessageError
+from settings import (DELIVERY_BACKOFF, DELIVERY_MAX_BACKOFF,
+                      DELIVERY_MAX_WORKERS)
+
+
+class ChatDelivery:
+    """Рассылает сообщения по чатам на ограниченном пуле потоков.
+
+    Сообщения одного чата отправляются последовательно и по порядку,
+    разные чаты - параллельно. Поток пула не ждет между попытками:
+    после ошибки чат пропускается до истечения экспоненциальной
+    задержки, а отправка повторяется при одном из следующих вызовов
+    `deliver`. Когда отложенный чат снова принимает сообщения (например,
+    Telegram вернулся после сбоя), задержка остальных отложенных чатов
+    сбрасывается, чтобы очередь разобралась сразу.
+    """
+
+    def __init__(self, send, max_workers=DELIVERY_MAX_WORKERS,
+                 backoff=DELIVERY_BACKOFF, max_backoff=DELIVERY_MAX_BACKOFF,
+                 clock=time.monotonic):
+        self._send_message = send
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='delivery'
+        )
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._failures = {}
+        self._retry_at = {}
+        self._recovered = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Останавливает пул потоков."""
+        self._executor.shutdown(wait=True)
+
+    def _delay(self, chat_id):
+        """Считает задержку перед следующей попыткой отправки в чат."""
+        failures = self._failures.get(chat_id, 0)
+        return min(self._backoff * 2 ** (failures - 1), self._max_backoff)
+
+    def next_retry(self, chat_ids):
+        """Возвращает ближайшее время повторной отправки в чаты или None."""
+        return min(
+            (self._retry_at[chat_id] for chat_id in set(chat_ids)
+             if chat_id in self._retry_at),
+            default=None,
+        )
+
+    def _send(self, chat_id, text):
+        """Делает одну попытку отправки; при ошибке откладывает чат."""
+        try:
+            self._send_message(chat_id, text)
+        except SendMessageError:
+            self._failures[chat_id] = self._failures.get(chat_id, 0) + 1
+            self._retry_at[chat_id] = self._clock() + self._delay(chat_id)
+            logging.error(f'Ошибка отправки сообщения в чат {chat_id}: '
+                          f'`{text}`')
+            return False
+
+        if self._failures.pop(chat_id, None) is not None:
+            self._recovered = True
+        self._retry_at.pop(chat_id, None)
+        logging.info(f'Сообщение: `{text}` успешно отправлено.')
+        return True
+
+    def _deliver_chat(self, chat_id, texts):
+        """Отправляет сообщения чата по порядку до первой неудачи."""
+        if self._clock() < self._retry_at.get(chat_id, 0):
+            return 0
+
+        for sent, text in enumerate(texts):
+            if not self._send(chat_id, text):
+                return sent
+
+        return len(texts)
+
+    def deliver(self, messages):
+        """Рассылает пары (chat_id, text).
+
+        Возвращает списки доставленных и оставшихся пар; оставшиеся
+        сообщения каждого чата идут в исходном порядке.
+        """
+        chats = {}
+        for chat_id, text in messages:
+            chats.setdefault(chat_id, []).append(text)
+
+        futures = {
+            self._executor.submit(self._deliver_chat, chat_id, texts): chat_id
+            for chat_id, texts in chats.items()
+        }
+        sent_by_chat = {
+            futures[future]: future.result()
+            for future in as_completed(futures)
+        }
+
+        delivered, pending = [], []
+        for chat_id, texts in chats.items():
+            sent = sent_by_chat[chat_id]
+            delivered.extend((chat_id, text) for text in texts[:sent])
+            pending.extend((chat_id, text) for text in texts[sent:])
+
+        if self._recovered:
+            self._recovered = False
+            now = self._clock()
+            for chat_id, _ in pending:
+                self._retry_at[chat_id] = min(self._retry_at[chat_id], now)
+
+        return delivered, pending
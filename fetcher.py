@@ -0,0 +1,87 @@
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from settings import (ENDPOINT, FETCH_MAX_PER_HOST, FETCH_MAX_PER_TOKEN,
+                      FETCH_MAX_WORKERS)
+
+FetchResult = namedtuple('FetchResult', 'token from_date response error')
+
+
+def auth_headers(token):
+    """Возвращает заголовки авторизации для токена Практикума."""
+    return {'Authorization': f'OAuth {token}'}
+
+
+class FanOutFetcher:
+    """Параллельно запрашивает ответы сервиса для пачки токенов.
+
+    Общее число запросов ограничено размером пула потоков, а число
+    одновременных запросов к хосту и по одному токену - семафорами.
+    Необязательный `consume(token, response)` обрабатывает ответ в том же
+    потоке, пока ограничения еще заняты: так потоковое тело ответа
+    читается до освобождения соединения.
+    """
+
+    def __init__(self, fetch, endpoint=ENDPOINT,
+                 max_workers=FETCH_MAX_WORKERS,
+                 max_per_host=FETCH_MAX_PER_HOST,
+                 max_per_token=FETCH_MAX_PER_TOKEN):
+        self._fetch = fetch
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='fetcher'
+        )
+        self._host = urlsplit(endpoint).netloc
+        self._max_per_host = max_per_host
+        self._max_per_token = max_per_token
+        self._limits = {}
+        self._limits_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Останавливает пул потоков."""
+        self._executor.shutdown(wait=True)
+
+    def _limit(self, key, size):
+        """Возвращает семафор для ключа, создавая его при первом обращении."""
+        with self._limits_lock:
+            semaphore = self._limits.get(key)
+            if semaphore is None:
+                semaphore = self._limits[key] = threading.BoundedSemaphore(
+                    size
+                )
+            return semaphore
+
+    def _fetch_one(self, token, from_date, consume=None):
+        """Выполняет один запрос в пределах ограничений хоста и токена."""
+        headers = auth_headers(token)
+        host_limit = self._limit(('host', self._host), self._max_per_host)
+        token_limit = self._limit(('token', token), self._max_per_token)
+        with token_limit, host_limit:
+            try:
+                response = self._fetch(from_date, headers)
+                if consume is not None:
+                    response = consume(token, response)
+            except Exception as e:
+                return FetchResult(token, from_date, None, e)
+
+        return FetchResult(token, from_date, response, None)
+
+    def fetch(self, batch, consume=None):
+        """Запрашивает пары (token, from_date) и отдает результаты по мере
+        готовности, не дожидаясь самого медленного запроса.
+
+        С `consume` в поле `response` результата лежит то, что он вернул.
+        """
+        futures = [
+            self._executor.submit(self._fetch_one, token, from_date, consume)
+            for token, from_date in batch
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -1,23 +1,36 @@
 import logging
 import os
 import time
+from contextlib import ExitStack, closing
+from functools import partial
 from http import HTTPStatus
 
 import requests
 import telegram
 from dotenv import load_dotenv
 
+from backlog import PRIORITY_ERROR, PRIORITY_STATUS, NotificationBacklog
+from config import load_config
+from delivery import ChatDelivery
 from exceptions import (APIResponseError, JSONDataStructureError,
-                        LoadEnvironmentError, SendMessageError)
-from settings import (ENDPOINT, HOMEWORK_STATES, HOMEWORK_STATUSES,
-                      NO_NAME_HOME_WORK, RETRY_TIME)
+                        SendMessageError)
+from fetcher import FanOutFetcher, auth_headers
+from scheduler import TimingWheel
+from settings import (API_TIMEOUT, ENDPOINT, HOMEWORK_STATES,
+                      HOMEWORK_STATUSES, LOCALE, NO_NAME_HOME_WORK,
+                      PARSE_MODE, STREAM_CHUNK_SIZE, TERMINAL_STATUSES)
+from state import HomeworkStates
+from streaming import decode_chunks, iter_homeworks
+from subscriptions import SubscriptionHub
+from telegram_client import TelegramClient
+from templates import render_error, render_status
+from tracing import TraceRecorder
 
 load_dotenv()
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
 logging.basicConfig(
     format='%(asctime)s | %(name)s | %(levelname)s | '
@@ -26,20 +39,44 @@ logging.basicConfig(
 )
 
 
+def create_bot(config):
+    """Создает клиент Telegram выбранного в настройках типа."""
+    if config.bot_backend == 'light':
+        return TelegramClient(
+            config.telegram_token, pool_size=config.telegram_pool_size,
+            timeout=config.telegram_timeout,
+        )
+
+    return telegram.Bot(token=config.telegram_token)
+
+
 def send_message(bot, message):
     """Отправляет сообщения в чат."""
+    send_chat_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_chat_message(bot, chat_id, message, parse_mode=PARSE_MODE):
+    """Отправляет сообщение в заданный чат."""
+    options = {'parse_mode': parse_mode} if parse_mode else {}
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        bot.send_message(chat_id, message, **options)
     except telegram.error.TelegramError as e:
         raise SendMessageError(e) from e
 
 
 def get_api_answer(current_timestamp):
     """Получает ответ от сервиса."""
+    return request_api_answer(current_timestamp, auth_headers(PRACTICUM_TOKEN))
+
+
+def request_api_answer(current_timestamp, headers, timeout=API_TIMEOUT):
+    """Получает ответ от сервиса с заданными заголовками авторизации."""
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = requests.get(
+            ENDPOINT, headers=headers, params=params, timeout=timeout
+        )
     except Exception as e:
         raise APIResponseError(e) from e
 
@@ -54,6 +91,42 @@ def get_api_answer(current_timestamp):
     return response
 
 
+def stream_api_answer(current_timestamp, headers,
+                      chunk_size=STREAM_CHUNK_SIZE, timeout=API_TIMEOUT):
+    """Запрашивает ответ сервиса потоком и отдает домашние работы по одной.
+
+    Соединение и статус ответа проверяются сразу, тело ответа читается
+    по мере обхода возвращаемого итератора. `timeout` ограничивает
+    и установку соединения, и ожидание каждого куска тела.
+    """
+    timestamp = current_timestamp or int(time.time())
+    params = {'from_date': timestamp}
+    try:
+        response = requests.get(
+            ENDPOINT, headers=headers, params=params, stream=True,
+            timeout=timeout,
+        )
+    except Exception as e:
+        raise APIResponseError(e) from e
+
+    if response.status_code != HTTPStatus.OK:
+        response.close()
+        raise APIResponseError(f'Неожиданный статус ответа: {response}')
+
+    return iter_response_homeworks(response, chunk_size)
+
+
+def iter_response_homeworks(response, chunk_size=STREAM_CHUNK_SIZE):
+    """Разбирает тело потокового ответа, не загружая его целиком."""
+    with response:
+        try:
+            yield from iter_homeworks(
+                decode_chunks(response.iter_content(chunk_size))
+            )
+        except requests.RequestException as e:
+            raise APIResponseError(e) from e
+
+
 def check_response(response):
     """Проверят корректность ответа сервиса, и отдает список домашних работ."""
     if type(response) != dict:
@@ -78,6 +151,13 @@ def check_response(response):
 
 def parse_status(homework):
     """Извлекает статус проверки домашней работы и возвращает его."""
+    return diff_status(homework, HOMEWORK_STATES)
+
+
+def diff_status(homework, states, locale=LOCALE, parse_mode=PARSE_MODE):
+    """Сравнивает статус работы с сохраненным в `states`, возвращает
+    сообщение о смене статуса или None.
+    """
     homework_status = homework.get('status')
     if homework_status is None:
         raise KeyError('Отсутствует ключ `status`')
@@ -89,14 +169,13 @@ def parse_status(homework):
     if homework_name is None:
         homework_name = NO_NAME_HOME_WORK
 
-    if HOMEWORK_STATES.get(homework_name) == homework_status:
+    if states.get(homework_name) == homework_status:
         logging.debug(f'Статус проверки `{homework_name}` не изменился.')
         return
 
-    verdict = HOMEWORK_STATUSES[homework_status]
-    HOMEWORK_STATES[homework_name] = homework_status
+    states[homework_name] = homework_status
 
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return render_status(homework_name, homework_status, locale, parse_mode)
 
 
 def check_tokens():
@@ -121,63 +200,125 @@ def get_hw_date_update(homework):
     return int(time.mktime(struct_time))
 
 
-def main():  # noqa: C901
-    """Основная логика работы бота."""
-    if not check_tokens():
-        raise LoadEnvironmentError('Ошибка загрузки переменных окружения')
-
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
-
-    pending_messages = []
-    sending_errors_msg = []
-
+def report_error(error, locale=LOCALE, parse_mode=PARSE_MODE):
+    """Логирует ошибку опроса и возвращает текст уведомления о ней."""
+    except_msg = render_error(error, locale, parse_mode)
+    expected = isinstance(error, (APIResponseError, JSONDataStructureError,
+                                  KeyError, TypeError))
+    logging.error(except_msg, exc_info=None if expected else error)
+    return except_msg
+
+
+def queue_update(backlog, update, sent_errors, locale=LOCALE,
+                 parse_mode=PARSE_MODE):
+    """Ставит в очередь изменения и ошибку опроса токена для его чатов.
+
+    Возвращает пары (chat_id, text) уведомлений об ошибке.
+    """
+    except_msg = None
+    if update.error:
+        except_msg = report_error(update.error, locale, parse_mode)
+    error_messages = set()
+    for chat_id in update.chat_ids:
+        for homework_name, message in update.changes:
+            backlog.push(chat_id, message, PRIORITY_STATUS, key=homework_name)
+        if except_msg and (chat_id, except_msg) not in sent_errors:
+            backlog.push(chat_id, except_msg, PRIORITY_ERROR, key=except_msg)
+            error_messages.add((chat_id, except_msg))
+
+    return error_messages
+
+
+def run_bot(config, resources):
+    """Собирает компоненты бота и опрашивает сервис до остановки.
+
+    Трасса и холодное хранилище статусов регистрируются в `resources`
+    (ExitStack) и закрываются при выходе из `main`.
+    """
+    states = resources.enter_context(closing(HomeworkStates(
+        config.state_memory_budget, config.state_cold_path, TERMINAL_STATUSES
+    )))
+
+    bot = create_bot(config)
+    api_answer = partial(request_api_answer, timeout=config.api_timeout)
+    check = check_response
+    if config.stream_responses:
+        api_answer = partial(
+            stream_api_answer, chunk_size=config.stream_chunk_size,
+            timeout=config.api_timeout,
+        )
+        check = iter
+    if config.trace_path:
+        recorder = resources.enter_context(TraceRecorder(
+            config.trace_path,
+            secrets=(config.practicum_token, config.telegram_token),
+        ))
+        if config.stream_responses:
+            logging.warning('Потоковые ответы сервиса не пишутся в трассу.')
+        else:
+            api_answer = recorder.wrap_api(api_answer)
+        bot = recorder.wrap_bot(bot)
+    fetcher = FanOutFetcher(
+        api_answer,
+        max_workers=config.fetch_max_workers,
+        max_per_host=config.fetch_max_per_host,
+        max_per_token=config.fetch_max_per_token,
+    )
+    hub = SubscriptionHub(
+        fetcher, check,
+        partial(diff_status, locale=config.locale,
+                parse_mode=config.parse_mode),
+        get_hw_date_update,
+        interval=config.retry_time,
+        states_factory=lambda token: states,
+    )
+    for chat_id in (config.telegram_chat_id,) + config.telegram_extra_chat_ids:
+        hub.subscribe(config.practicum_token, chat_id)
+    scheduler = TimingWheel(config.retry_time, config.scheduler_tick)
+    scheduler.spread(hub.tokens())
+    delivery = ChatDelivery(
+        partial(send_chat_message, bot, parse_mode=config.parse_mode),
+        max_workers=config.delivery_max_workers,
+        backoff=config.delivery_backoff,
+        max_backoff=config.delivery_max_backoff,
+    )
+    backlog = NotificationBacklog(config.backlog_limit)
+    poll_loop(hub, scheduler, delivery, backlog, states, config)
+
+
+def poll_loop(hub, scheduler, delivery, backlog, states, config,
+              sleep=time.sleep):
+    """Опрашивает токены по расписанию и рассылает уведомления.
+
+    Цикл просыпается к ближайшему опросу или к ближайшей повторной
+    отправке в чат с недоставленными уведомлениями, не дожидаясь
+    следующего опроса.
+    """
+    error_messages = set()
+    sent_errors = set()
+    wake_at = None
     while True:
-        try:
-            except_msg = ""
-            response = get_api_answer(current_timestamp)
-            logging.debug(f'Время запроса: {response}')
-            logging.debug(f'Получен ответ от сервиса: {response}')
-            homeworks = check_response(response)
-            for hw in homeworks:
-                message = parse_status(hw)
-                if message:
-                    current_timestamp = get_hw_date_update(hw)
-                    pending_messages.append(message)
-
-        except APIResponseError as e:
-            except_msg = f'Ошибка ответа от сервиса: {e}'
-            logging.error(except_msg)
-        except JSONDataStructureError as e:
-            except_msg = f'Ошибка данных JSON: {e}'
-            logging.error(e)
-        except KeyError as e:
-            except_msg = f'Ошибка ключей словаря: {e}'
-            logging.error(except_msg)
-        except TypeError as e:
-            except_msg = f'Ошибка типа данных: {e}'
-            logging.error(except_msg)
-        except Exception as e:
-            except_msg = f'Сбой в работе программы: {e}'
-            logging.error(except_msg, exc_info=True)
-
-        if not (except_msg in sending_errors_msg) and except_msg:
-            pending_messages.append(except_msg)
-
-        _pending_messages = pending_messages[:]
-        for msg in pending_messages:
-            try:
-                send_message(bot, msg)
-                logging.info(f'Сообщение: `{msg}` успешно отправлено.')
-                _pending_messages.remove(msg)
-                if msg == except_msg:
-                    sending_errors_msg.append(except_msg)
-            except SendMessageError:
-                logging.error(f'Ошибка отправки сообщения боту: `{msg}`')
-
-        pending_messages = _pending_messages[:]
-
-        time.sleep(RETRY_TIME)
+        due_tokens = scheduler.wait_due(sleep, wake_at)
+        for update in hub.poll(due_tokens):
+            error_messages |= queue_update(
+                backlog, update, sent_errors, config.locale, config.parse_mode
+            )
+        for token in due_tokens:
+            scheduler.defer(token)
+        if due_tokens and logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(f'Память статусов: {states.memory_report()}')
+
+        delivered, pending = delivery.deliver(backlog.pending())
+        backlog.discard(delivered)
+        sent_errors.update(error_messages.intersection(delivered))
+        wake_at = delivery.next_retry(chat_id for chat_id, _ in pending)
+
+
+def main():
+    """Основная логика работы бота."""
+    config = load_config()
+    with ExitStack() as resources:
+        run_bot(config, resources)
 
 
 if __name__ == '__main__':
@@ -186,5 +327,6 @@ if __name__ == '__main__':
     try:
         main()
     except KeyboardInterrupt:
+        # Файлы уже закрыты при выходе из main, пулы потоков не ждем.
         print('\nShutdown yashabot ...')
         os._exit(0)
@@ -0,0 +1,123 @@
+import time
+
+from settings import RETRY_TIME, SCHEDULER_TICK
+
+
+class TimingWheel:
+    """Колесо таймеров для дедлайнов следующего опроса подписчиков.
+
+    Интервал опроса разбит на слоты по `tick` секунд. Постановка и
+    перенос дедлайна занимают O(1), а просыпаться нужно только когда
+    в ближайшем непустом слоте есть работа.
+    """
+
+    def __init__(self, interval=RETRY_TIME, tick=SCHEDULER_TICK,
+                 clock=time.monotonic):
+        self._interval = interval
+        self._tick = tick
+        self._clock = clock
+        self._slots = [set() for _ in range(max(1, int(interval // tick)))]
+        self._entries = {}
+        self._cursor = self._tick_of(clock())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _tick_of(self, moment):
+        return int(moment // self._tick)
+
+    def _slot(self, tick):
+        return self._slots[tick % len(self._slots)]
+
+    def now(self):
+        """Текущее время часов планировщика."""
+        return self._clock()
+
+    def deadline(self, key):
+        """Возвращает дедлайн ключа или None."""
+        entry = self._entries.get(key)
+        return entry and entry[0]
+
+    def schedule(self, key, deadline):
+        """Ставит (или переносит) дедлайн опроса для ключа."""
+        self.cancel(key)
+        # Просроченный дедлайн кладется в текущий слот, чтобы не потеряться.
+        tick = max(self._tick_of(deadline), self._cursor)
+        self._entries[key] = (deadline, tick)
+        self._slot(tick).add(key)
+
+    def defer(self, key, delay=None):
+        """Переносит опрос ключа на `delay` секунд или на весь интервал."""
+        if delay is None:
+            delay = self._interval
+        self.schedule(key, self.now() + delay)
+
+    def cancel(self, key):
+        """Удаляет ключ из планировщика."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._slot(entry[1]).discard(key)
+
+    def spread(self, keys, start=None):
+        """Равномерно распределяет первые опросы ключей по интервалу."""
+        keys = list(keys)
+        if not keys:
+            return
+
+        start = self.now() if start is None else start
+        step = self._interval / len(keys)
+        for i, key in enumerate(keys):
+            self.schedule(key, start + i * step)
+
+    def pop_due(self, now=None):
+        """Извлекает ключи с наступившим дедлайном в порядке дедлайнов."""
+        now = self.now() if now is None else now
+        current = self._tick_of(now)
+        first = max(self._cursor, current - len(self._slots) + 1)
+
+        due = []
+        for tick in range(first, current + 1):
+            slot = self._slot(tick)
+            for key in [key for key in slot if self._entries[key][0] <= now]:
+                slot.discard(key)
+                due.append((self._entries.pop(key)[0], key))
+
+        self._cursor = max(self._cursor, current)
+        due.sort(key=lambda item: item[0])
+        return [key for _, key in due]
+
+    def next_deadline(self):
+        """Возвращает ближайший дедлайн или None, если ключей нет."""
+        if not self._entries:
+            return None
+
+        for tick in range(self._cursor, self._cursor + len(self._slots)):
+            deadlines = [
+                self._entries[key][0] for key in self._slot(tick)
+                if self._entries[key][1] == tick
+            ]
+            if deadlines:
+                return min(deadlines)
+
+        return min(deadline for deadline, _ in self._entries.values())
+
+    def wait_due(self, sleep=time.sleep, wake_at=None):
+        """Спит до ближайшего дедлайна и возвращает готовые к опросу ключи.
+
+        Если `wake_at` раньше ближайшего дедлайна, просыпается к нему
+        (ключей при этом может не оказаться).
+        """
+        deadline = self.next_deadline()
+        if wake_at is not None and (deadline is None or wake_at < deadline):
+            deadline = wake_at
+        if deadline is None:
+            return []
+
+        delay = deadline - self.now()
+        if delay > 0:
+            sleep(delay)
+
+        return self.pop_due()
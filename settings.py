@@ -1,11 +1,36 @@
 RETRY_TIME = 600
+SCHEDULER_TICK = 1
 
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+API_TIMEOUT = 30
+STREAM_RESPONSES = False
+STREAM_CHUNK_SIZE = 64 * 1024
 
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+STATE_MEMORY_BUDGET = 1024 * 1024
+STATE_COLD_PATH = 'homework_states'
+TERMINAL_STATUSES = ('approved',)
 HOMEWORK_STATES = {}
 NO_NAME_HOME_WORK = "NO_NAME_HOME_WORK"
+
+DEFAULT_BOT_BACKEND = 'telegram'
+TELEGRAM_API_URL = 'https://api.telegram.org/bot'
+TELEGRAM_POOL_SIZE = 10
+TELEGRAM_TIMEOUT = 10
+
+FETCH_MAX_WORKERS = 8
+FETCH_MAX_PER_HOST = 8
+FETCH_MAX_PER_TOKEN = 1
+
+LOCALE = 'ru'
+PARSE_MODE = None
+
+DELIVERY_MAX_WORKERS = 4
+DELIVERY_BACKOFF = 1
+DELIVERY_MAX_BACKOFF = 300
+
+BACKLOG_LIMIT = 100
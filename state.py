@@ -0,0 +1,155 @@
+import dbm
+import os
+import resource
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+# Примерные накладные расходы словаря на одну запись.
+ENTRY_OVERHEAD = 100
+
+
+def rss_bytes():
+    """Возвращает текущий RSS процесса в байтах."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Вне Linux доступен только пиковый RSS.
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class HomeworkStates(MutableMapping):
+    """Статусы домашних работ с ограничением занимаемой памяти.
+
+    Когда размер записей в памяти превышает `budget` байт, давно не
+    использованные работы с финальным статусом переносятся в холодное
+    хранилище dbm по пути `cold_path`. Чтение отдает запись из холодного
+    хранилища, не перенося ее в память, а запись того же статуса не
+    трогает диск: в память возвращается только изменившийся статус.
+    Работы с нефинальным статусом всегда остаются в памяти. Без
+    `cold_path` записи не вытесняются.
+    """
+
+    def __init__(self, budget, cold_path=None, terminal=('approved',)):
+        self._budget = budget
+        self._cold_path = cold_path
+        self._terminal = frozenset(terminal)
+        self._hot = OrderedDict()
+        self._hot_bytes = 0
+        self._cold = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _entry_size(key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+
+    def _cold_tier(self, create=False):
+        """Открывает холодное хранилище, если оно есть или нужно создать."""
+        if self._cold is None and self._cold_path:
+            if create or dbm.whichdb(self._cold_path):
+                self._cold = dbm.open(self._cold_path, 'c')
+        return self._cold
+
+    def _get_cold(self, key):
+        cold = self._cold_tier()
+        if cold is None:
+            return None
+        value = cold.get(key.encode())
+        return None if value is None else value.decode()
+
+    def _pop_cold(self, key):
+        value = self._get_cold(key)
+        if value is not None:
+            del self._cold[key.encode()]
+        return value
+
+    def _put_hot(self, key, value):
+        previous = self._hot.pop(key, None)
+        if previous is not None:
+            self._hot_bytes -= self._entry_size(key, previous)
+        self._hot[key] = value
+        self._hot_bytes += self._entry_size(key, value)
+
+    def _evict(self):
+        """Вытесняет давно не использованные финальные записи."""
+        if self._hot_bytes <= self._budget or not self._cold_path:
+            return
+
+        cold = self._cold_tier(create=True)
+        for key, value in list(self._hot.items()):
+            if self._hot_bytes <= self._budget:
+                break
+            if value in self._terminal:
+                cold[key.encode()] = value.encode()
+                del self._hot[key]
+                self._hot_bytes -= self._entry_size(key, value)
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return self._hot[key]
+
+            value = self._get_cold(key)
+            if value is None:
+                raise KeyError(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key not in self._hot:
+                cold_value = self._get_cold(key)
+                if cold_value == value:
+                    return
+                if cold_value is not None:
+                    del self._cold[key.encode()]
+            self._put_hot(key, value)
+            self._evict()
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key in self._hot:
+                self._hot_bytes -= self._entry_size(key, self._hot.pop(key))
+            elif self._pop_cold(key) is None:
+                raise KeyError(key)
+
+    def __iter__(self):
+        with self._lock:
+            keys = list(self._hot)
+            cold = self._cold_tier()
+            if cold is not None:
+                keys.extend(key.decode() for key in cold.keys())
+        return iter(keys)
+
+    def __len__(self):
+        with self._lock:
+            cold = self._cold_tier()
+            return len(self._hot) + (len(cold) if cold is not None else 0)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._hot:
+                return True
+            cold = self._cold_tier()
+            return cold is not None and key.encode() in cold
+
+    def close(self):
+        """Закрывает холодное хранилище."""
+        with self._lock:
+            if self._cold is not None:
+                self._cold.close()
+                self._cold = None
+
+    def memory_report(self):
+        """Возвращает размеры горячего и холодного уровней и RSS процесса."""
+        with self._lock:
+            cold = self._cold_tier()
+            return {
+                'hot_entries': len(self._hot),
+                'hot_bytes': self._hot_bytes,
+                'cold_entries': len(cold) if cold is not None else 0,
+                'rss_bytes': rss_bytes(),
+            }
@@ -0,0 +1,136 @@
+import codecs
+import json
+
+from exceptions import JSONDataStructureError
+
+DECODER = json.JSONDecoder()
+WHITESPACE = ' \t\n\r'
+
+
+def decode_chunks(byte_chunks, encoding='utf-8'):
+    """Декодирует поток байтов в поток строк без разрыва символов."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class JSONStream:
+    """Последовательно читает значения JSON из потока строк.
+
+    В буфере хранится только еще не разобранная часть потока.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Дочитывает следующий кусок потока; False, если поток закончился."""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Возвращает следующий значимый символ или '' в конце потока."""
+        while True:
+            while (self._pos < len(self._buffer)
+                   and self._buffer[self._pos] in WHITESPACE):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        """Пропускает один из ожидаемых символов и возвращает его."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise JSONDataStructureError(
+                f'Некорректный JSON: ожидается один из `{chars}`, '
+                f'принят `{char}`'
+            )
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Читает следующее значение JSON целиком."""
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise JSONDataStructureError(f'Некорректный JSON: {e}')
+            # Число в конце буфера может продолжаться в следующем куске.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_homeworks(chunks):
+    """Отдает домашние работы из потока ответа сервиса по одной.
+
+    Проверки повторяют `check_response`: ошибки структуры ответа
+    выбрасываются как JSONDataStructureError, ответ не-словарь - TypeError.
+    """
+    stream = JSONStream(chunks)
+    if stream.peek() != '{':
+        raise TypeError(f'Неожиданный тип данных, ожидается {dict}')
+
+    stream.expect('{')
+    found = False
+    while stream.peek() != '}':
+        key = stream.value()
+        stream.expect(':')
+        if key != 'homeworks':
+            stream.value()
+        else:
+            found = True
+            yield from iter_array(stream)
+        if stream.expect(',}') == '}':
+            break
+    else:
+        stream.expect('}')
+
+    if not found:
+        raise JSONDataStructureError('Данные не содержат ключа: `homeworks`')
+
+
+def iter_array(stream):
+    """Отдает элементы массива `homeworks` по мере чтения потока."""
+    if stream.peek() != '[':
+        raise JSONDataStructureError(
+            f'Неожиданный тип данных для ключа: `homeworks`, ожидается {list}'
+        )
+
+    stream.expect('[')
+    if stream.peek() == ']':
+        stream.expect(']')
+        raise JSONDataStructureError('Список домашних работ пуст')
+
+    while True:
+        homework = stream.value()
+        if not isinstance(homework, dict):
+            raise JSONDataStructureError(
+                f'Неожиданный тип данных домашней работы {type(homework)}, '
+                f'ожидается {dict}'
+            )
+        yield homework
+        if stream.expect(',]') == ']':
+            return
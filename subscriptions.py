@@ -0,0 +1,113 @@
+import time
+from collections import namedtuple
+
+from settings import NO_NAME_HOME_WORK, RETRY_TIME
+
+TokenUpdate = namedtuple('TokenUpdate', 'token chat_ids changes error')
+
+
+class SubscriptionHub:
+    """Подписки чатов на токены Практикума с одним запросом на токен.
+
+    Ответ сервиса для токена запрашивается и сравнивается с сохраненными
+    статусами один раз, а найденные изменения раздаются всем чатам,
+    подписанным на этот токен. Сравнение выполняется в потоке запроса,
+    поэтому потоковый ответ разбирается, пока заняты ограничения
+    запросов. Результат опроса токена кэшируется на интервал опроса:
+    повторный опрос в течение интервала не обращается к сервису.
+    """
+
+    def __init__(self, fetcher, check_response, diff_status, date_updated,
+                 interval=RETRY_TIME, states_factory=lambda token: {},
+                 clock=time.monotonic):
+        self._fetcher = fetcher
+        self._check_response = check_response
+        self._diff_status = diff_status
+        self._date_updated = date_updated
+        self._interval = interval
+        self._states_factory = states_factory
+        self._clock = clock
+        self._subscribers = {}
+        self._states = {}
+        self._from_dates = {}
+        self._cache = {}
+
+    def subscribe(self, token, chat_id):
+        """Подписывает чат на уведомления по токену."""
+        chats = self._subscribers.setdefault(token, [])
+        if chat_id not in chats:
+            chats.append(chat_id)
+        if token not in self._states:
+            self._states[token] = self._states_factory(token)
+            self._from_dates[token] = int(time.time())
+
+    def unsubscribe(self, token, chat_id):
+        """Отписывает чат; токен без подписчиков больше не опрашивается."""
+        chats = self._subscribers.get(token, [])
+        if chat_id in chats:
+            chats.remove(chat_id)
+        if not chats:
+            for data in (self._subscribers, self._states, self._from_dates,
+                         self._cache):
+                data.pop(token, None)
+
+    def tokens(self):
+        """Возвращает токены, у которых есть подписчики."""
+        return list(self._subscribers)
+
+    def subscribers(self, token):
+        """Возвращает чаты, подписанные на токен."""
+        return tuple(self._subscribers.get(token, ()))
+
+    def latest(self, token):
+        """Возвращает последний результат опроса токена, пока он свежий."""
+        cached = self._cache.get(token)
+        if cached is not None and cached[0] > self._clock():
+            return cached[1]
+        return None
+
+    def _diff(self, token, response):
+        """Находит изменения статусов в ответе сервиса для токена."""
+        changes = []
+        try:
+            for homework in self._check_response(response):
+                message = self._diff_status(homework, self._states[token])
+                if message:
+                    self._from_dates[token] = self._date_updated(homework)
+                    changes.append((
+                        homework.get('homework_name') or NO_NAME_HOME_WORK,
+                        message,
+                    ))
+        except Exception as e:
+            return tuple(changes), e
+
+        return tuple(changes), None
+
+    def poll(self, tokens=None):
+        """Опрашивает токены без свежего результата в кэше.
+
+        Отдает TokenUpdate по мере получения ответов: изменения
+        `(homework_name, message)` и ошибку для всех подписчиков токена.
+        """
+        tokens = self.tokens() if tokens is None else [
+            token for token in tokens if token in self._subscribers
+        ]
+        stale = [token for token in tokens if self.latest(token) is None]
+        results = self._fetcher.fetch(
+            ((token, self._from_dates[token]) for token in stale),
+            consume=self._diff,
+        )
+        for result in results:
+            if result.token not in self._subscribers:
+                continue
+            if result.error is not None:
+                changes, error = (), result.error
+            else:
+                changes, error = result.response
+            update = TokenUpdate(
+                result.token, self.subscribers(result.token), changes, error
+            )
+            self._cache[result.token] = (
+                self._clock() + self._interval, update
+            )
+            yield update
@@ -0,0 +1,78 @@
+import json
+from urllib.parse import urlsplit
+
+import certifi
+import urllib3
+from requests.utils import get_environ_proxies
+
+from exceptions import SendMessageError
+from settings import TELEGRAM_API_URL, TELEGRAM_POOL_SIZE, TELEGRAM_TIMEOUT
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class TelegramClient:
+    """Минимальный клиент метода `sendMessage` Telegram Bot API.
+
+    Повторяет интерфейс `telegram.Bot.send_message`, но держит только
+    пул keep-alive соединений urllib3 к серверу API.
+    """
+
+    __slots__ = ('_token', '_path', '_pool', '_timeout')
+
+    def __init__(self, token, base_url=TELEGRAM_API_URL,
+                 pool_size=TELEGRAM_POOL_SIZE, timeout=TELEGRAM_TIMEOUT):
+        url = f'{base_url}{token}/sendMessage'
+        self._token = str(token)
+        self._path = urlsplit(url).path
+        self._timeout = timeout
+
+        # Пул соединений и прокси из окружения определяются один раз.
+        options = {'maxsize': pool_size, 'block': False, 'retries': False}
+        if url.startswith('https://'):
+            options['ca_certs'] = certifi.where()
+        proxy = get_environ_proxies(url).get(urlsplit(url).scheme)
+        if proxy:
+            manager = urllib3.ProxyManager(proxy, **options)
+            self._pool = manager.connection_from_url(url)
+        else:
+            self._pool = urllib3.connection_from_url(url, **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Закрывает соединения пула."""
+        self._pool.close()
+
+    def _scrub(self, text):
+        """Убирает токен бота из текста ошибки."""
+        return str(text).replace(self._token, '***')
+
+    def send_message(self, chat_id, text, **kwargs):
+        """Отправляет сообщение в чат, ошибки отдает как SendMessageError."""
+        payload = {'chat_id': chat_id, 'text': text, **kwargs}
+        try:
+            response = self._pool.urlopen(
+                'POST', self._path, body=json.dumps(payload).encode(),
+                headers=JSON_HEADERS, timeout=self._timeout,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise SendMessageError(self._scrub(e)) from None
+
+        try:
+            data = json.loads(response.data)
+        except ValueError:
+            raise SendMessageError(
+                f'Неожиданный формат ответа Telegram: {response.status}'
+            ) from None
+
+        if not data.get('ok'):
+            raise SendMessageError(
+                f'{data.get("error_code")}: {data.get("description")}'
+            )
+
+        return data.get('result')
@@ -0,0 +1,118 @@
+import html
+import re
+import sys
+
+from exceptions import APIResponseError, JSONDataStructureError
+from settings import HOMEWORK_STATUSES, LOCALE, PARSE_MODE
+
+STATUS_TEMPLATES = {
+    'ru': 'Изменился статус проверки работы "{name}". {verdict}',
+    'en': 'Homework "{name}" review status changed. {verdict}',
+}
+VERDICTS = {
+    'ru': HOMEWORK_STATUSES,
+    'en': {
+        'approved': 'Homework approved: the reviewer liked it all. Hooray!',
+        'reviewing': 'Homework is being reviewed.',
+        'rejected': 'Homework reviewed: the reviewer has some remarks.',
+    },
+}
+ERROR_TEMPLATES = {
+    'ru': {
+        APIResponseError: 'Ошибка ответа от сервиса: {error}',
+        JSONDataStructureError: 'Ошибка данных JSON: {error}',
+        KeyError: 'Ошибка ключей словаря: {error}',
+        TypeError: 'Ошибка типа данных: {error}',
+        Exception: 'Сбой в работе программы: {error}',
+    },
+    'en': {
+        APIResponseError: 'Service response error: {error}',
+        JSONDataStructureError: 'JSON data error: {error}',
+        KeyError: 'Dictionary key error: {error}',
+        TypeError: 'Data type error: {error}',
+        Exception: 'Program failure: {error}',
+    },
+}
+
+MARKDOWN_SPECIAL = re.compile(r'([_*\[\]()~`>#+\-=|{}.!\\])')
+ESCAPES = {
+    None: str,
+    'HTML': lambda text: html.escape(str(text), quote=False),
+    'MarkdownV2': lambda text: MARKDOWN_SPECIAL.sub(r'\\\1', str(text)),
+}
+MARKUP = {
+    None: '{}',
+    'HTML': '<b>{}</b>',
+    'MarkdownV2': '*{}*',
+}
+
+
+class MessageTemplate:
+    """Предкомпилированный шаблон сообщения с одной подстановкой.
+
+    Статичные части шаблона экранируются для режима разметки и
+    интернируются один раз, при рендеринге экранируется только значение.
+    """
+
+    __slots__ = ('head', 'tail', 'escape')
+
+    def __init__(self, template, placeholder, parse_mode=None, markup=True):
+        escape = ESCAPES[parse_mode]
+        head, tail = template.split(placeholder)
+        open_tag, close_tag = (MARKUP[parse_mode] if markup else '{}').split(
+            '{}'
+        )
+        self.head = sys.intern(escape(head) + open_tag)
+        self.tail = sys.intern(close_tag + escape(tail))
+        self.escape = escape
+
+    def render(self, value):
+        """Возвращает сообщение с подставленным значением."""
+        return self.head + self.escape(value) + self.tail
+
+
+def compile_status_templates():
+    """Компилирует шаблоны смены статуса для всех (статус, язык, разметка)."""
+    return {
+        (status, locale, parse_mode): MessageTemplate(
+            template.replace('{verdict}', verdict), '{name}', parse_mode
+        )
+        for locale, template in STATUS_TEMPLATES.items()
+        for status, verdict in VERDICTS[locale].items()
+        for parse_mode in ESCAPES
+    }
+
+
+def compile_error_templates():
+    """Компилирует шаблоны сообщений об ошибках по (тип, язык, разметка)."""
+    return {
+        (error_type, locale, parse_mode): MessageTemplate(
+            template, '{error}', parse_mode, markup=False
+        )
+        for locale, templates in ERROR_TEMPLATES.items()
+        for error_type, template in templates.items()
+        for parse_mode in ESCAPES
+    }
+
+
+COMPILED_STATUS_TEMPLATES = compile_status_templates()
+COMPILED_ERROR_TEMPLATES = compile_error_templates()
+
+
+def render_status(homework_name, status, locale=LOCALE,
+                  parse_mode=PARSE_MODE):
+    """Возвращает сообщение о смене статуса домашней работы."""
+    template = COMPILED_STATUS_TEMPLATES[status, locale, parse_mode]
+    return template.render(homework_name)
+
+
+def render_error(error, locale=LOCALE, parse_mode=PARSE_MODE):
+    """Возвращает сообщение об ошибке по ближайшему типу исключения."""
+    for error_type in type(error).__mro__:
+        template = COMPILED_ERROR_TEMPLATES.get(
+            (error_type, locale, parse_mode)
+        )
+        if template is not None:
+            return template.render(error)
+
+    raise KeyError(f'Нет шаблона ошибки для {type(error)}')
@@ -0,0 +1,50 @@
+from backlog import (PRIORITY_ERROR, PRIORITY_RECOVERY, PRIORITY_STATUS,
+                     NotificationBacklog)
+
+
+class TestNotificationBacklog:
+
+    def test_pending_orders_by_priority_then_fifo(self):
+        backlog = NotificationBacklog(limit=10)
+        backlog.push(1, 'error', PRIORITY_ERROR)
+        backlog.push(1, 'recovered', PRIORITY_RECOVERY)
+        backlog.push(1, 'hw1 reviewing', PRIORITY_STATUS, key='hw1')
+        backlog.push(2, 'hw2 rejected', PRIORITY_STATUS, key='hw2')
+
+        assert backlog.pending() == [
+            (1, 'hw1 reviewing'), (2, 'hw2 rejected'),
+            (1, 'recovered'), (1, 'error'),
+        ], 'Смены статусов должны отправляться раньше остальных уведомлений'
+
+    def test_superseded_transition_is_collapsed(self):
+        backlog = NotificationBacklog(limit=10)
+        backlog.push(1, 'hw1 reviewing', PRIORITY_STATUS, key='hw1')
+        backlog.push(2, 'hw1 reviewing', PRIORITY_STATUS, key='hw1')
+        backlog.push(1, 'hw1 approved', PRIORITY_STATUS, key='hw1')
+
+        assert backlog.pending() == [(2, 'hw1 reviewing'), (1, 'hw1 approved')]
+
+    def test_overflow_sheds_least_important_oldest(self):
+        backlog = NotificationBacklog(limit=3)
+        backlog.push(1, 'error 1', PRIORITY_ERROR)
+        backlog.push(1, 'error 2', PRIORITY_ERROR)
+        backlog.push(1, 'hw1', PRIORITY_STATUS, key='hw1')
+
+        assert backlog.push(1, 'hw2', PRIORITY_STATUS, key='hw2')
+        assert backlog.pending() == [(1, 'hw1'), (1, 'hw2'), (1, 'error 2')]
+
+        assert backlog.push(1, 'hw3', PRIORITY_STATUS, key='hw3')
+        assert not backlog.push(1, 'error 3', PRIORITY_ERROR), (
+            'Менее важное уведомление не должно вытеснять смены статусов'
+        )
+        assert backlog.pending() == [(1, 'hw1'), (1, 'hw2'), (1, 'hw3')]
+
+    def test_discard_delivered(self):
+        backlog = NotificationBacklog(limit=10)
+        backlog.push(1, 'hw1', PRIORITY_STATUS, key='hw1')
+        backlog.push(1, 'error', PRIORITY_ERROR)
+        backlog.discard([(1, 'hw1')])
+
+        assert backlog.pending() == [(1, 'error')]
+        backlog.push(1, 'hw1 again', PRIORITY_STATUS, key='hw1')
+        assert len(backlog) == 2
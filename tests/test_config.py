@@ -0,0 +1,116 @@
+import dataclasses
+
+import pytest
+
+from config import load_config
+from exceptions import LoadEnvironmentError
+from settings import API_TIMEOUT, RETRY_TIME
+
+ENVIRON = {
+    'PRACTICUM_TOKEN': 'sometoken',
+    'TELEGRAM_TOKEN': '1234:abcdefg',
+    'TELEGRAM_CHAT_ID': '12345',
+}
+
+
+class TestConfig:
+
+    def test_defaults_and_types(self):
+        config = load_config({
+            **ENVIRON,
+            'DELIVERY_MAX_WORKERS': '5',
+            'TELEGRAM_EXTRA_CHAT_IDS': '-100, @group,',
+            'STREAM_RESPONSES': 'yes',
+        })
+
+        assert config.telegram_chat_id == '12345'
+        assert config.retry_time == RETRY_TIME
+        assert config.api_timeout == API_TIMEOUT
+        assert config.delivery_max_workers == 5
+        assert config.parse_mode is None
+        assert config.telegram_extra_chat_ids == ('-100', '@group')
+        assert config.stream_responses is True
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.retry_time = 1
+
+    def test_file_is_overridden_by_environment(self, tmp_path):
+        path = tmp_path / 'bot.ini'
+        path.write_text(
+            '[homework_bot]\n'
+            'retry_time = 60\n'
+            'fetch_max_workers = 16\n'
+            'parse_mode = HTML\n',
+            encoding='utf-8'
+        )
+        config = load_config(
+            {**ENVIRON, 'BOT_CONFIG': str(path), 'RETRY_TIME': '30'}
+        )
+
+        assert config.retry_time == 30
+        assert config.fetch_max_workers == 16
+        assert config.parse_mode == 'HTML'
+
+    def test_all_errors_are_reported_once(self):
+        environ = {
+            **ENVIRON,
+            'TELEGRAM_TOKEN': 'broken',
+            'RETRY_TIME': '0',
+            'BOT_BACKEND': 'unknown',
+            'BACKLOG_LIMIT': 'many',
+        }
+        del environ['PRACTICUM_TOKEN']
+
+        with pytest.raises(LoadEnvironmentError) as e:
+            load_config(environ)
+        message = str(e.value)
+        for name in ['PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'RETRY_TIME',
+                     'BOT_BACKEND', 'BACKLOG_LIMIT']:
+            assert name in message, f'Не сообщается об ошибке в {name}'
+        assert 'broken' not in message, (
+            'Значения токенов не должны попадать в текст ошибки'
+        )
+
+    def test_missing_config_file(self, tmp_path):
+        with pytest.raises(LoadEnvironmentError):
+            load_config(ENVIRON, path=str(tmp_path / 'missing.ini'))
+
+    def test_config_file_values_are_not_interpolated(self, tmp_path):
+        path = tmp_path / 'bot.ini'
+        path.write_text(
+            '[homework_bot]\nstate_cold_path = /data/100%\n',
+            encoding='utf-8'
+        )
+        config = load_config(ENVIRON, path=str(path))
+
+        assert config.state_cold_path == '/data/100%'
+
+    def test_broken_config_file(self, tmp_path):
+        path = tmp_path / 'bot.ini'
+        path.write_text('retry_time = 60\n', encoding='utf-8')
+
+        with pytest.raises(LoadEnvironmentError):
+            load_config(ENVIRON, path=str(path))
+
+    def test_unknown_config_file_keys_are_rejected(self, tmp_path):
+        path = tmp_path / 'bot.ini'
+        path.write_text(
+            '[homework_bot]\nretry_tme = 5\nretry_time = 60\n',
+            encoding='utf-8'
+        )
+
+        with pytest.raises(LoadEnvironmentError) as e:
+            load_config(ENVIRON, path=str(path))
+        assert 'retry_tme' in str(e.value), (
+            'Опечатка в имени параметра не должна игнорироваться'
+        )
+
+    @pytest.mark.parametrize('settings, name', [
+        ({'DELIVERY_BACKOFF': '10', 'DELIVERY_MAX_BACKOFF': '1'},
+         'DELIVERY_BACKOFF'),
+        ({'BOT_BACKEND': 'light', 'DELIVERY_MAX_WORKERS': '20',
+          'TELEGRAM_POOL_SIZE': '4'}, 'DELIVERY_MAX_WORKERS'),
+    ])
+    def test_related_settings_are_checked(self, settings, name):
+        with pytest.raises(LoadEnvironmentError) as e:
+            load_config({**ENVIRON, **settings})
+        assert name in str(e.value)
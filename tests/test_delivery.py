@@ -0,0 +1,119 @@
+import threading
+import time
+
+from delivery import ChatDelivery
+from exceptions import SendMessageError
+from utils import FakeClock
+
+
+class FlakySender:
+
+    def __init__(self, broken_chats=(), failures_before_success=None,
+                 delay=0):
+        self.broken_chats = set(broken_chats)
+        self.failures_before_success = failures_before_success or {}
+        self.delay = delay
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def __call__(self, chat_id, text):
+        with self.lock:
+            left = self.failures_before_success.get(chat_id, 0)
+            if left:
+                self.failures_before_success[chat_id] = left - 1
+                raise SendMessageError('flaky')
+        if chat_id in self.broken_chats:
+            time.sleep(self.delay)
+            raise SendMessageError('broken')
+        with self.lock:
+            self.sent.append((chat_id, text))
+
+
+class TestChatDelivery:
+
+    def make_delivery(self, sender, clock, **kwargs):
+        return ChatDelivery(
+            sender, max_workers=4, backoff=1, max_backoff=8, clock=clock,
+            **kwargs
+        )
+
+    def test_failing_chat_does_not_block_others(self):
+        sender = FlakySender(broken_chats={1})
+        clock = FakeClock()
+        messages = [(1, 'a1'), (2, 'b1'), (1, 'a2'), (2, 'b2'), (3, 'c1')]
+        with self.make_delivery(sender, clock) as delivery:
+            delivered, pending = delivery.deliver(messages)
+
+        assert delivered == [(2, 'b1'), (2, 'b2'), (3, 'c1')], (
+            'Ошибки одного чата не должны задерживать другие чаты'
+        )
+        assert pending == [(1, 'a1'), (1, 'a2')], (
+            'Недоставленные сообщения чата должны сохранять порядок'
+        )
+
+    def test_many_failing_chats_do_not_block_healthy_one(self):
+        broken = range(1, 9)
+        sender = FlakySender(broken_chats=broken, delay=0.01)
+        messages = [(chat_id, 'fail') for chat_id in broken] + [(0, 'ok')]
+        with ChatDelivery(sender, max_workers=4, backoff=60) as delivery:
+            started = time.monotonic()
+            delivered, pending = delivery.deliver(messages)
+            elapsed = time.monotonic() - started
+
+        assert delivered == [(0, 'ok')]
+        assert len(pending) == len(broken)
+        assert elapsed < 1, (
+            'Поток пула не должен ждать задержку перед повторной отправкой'
+        )
+
+    def test_retry_waits_for_next_pass_and_keeps_order(self):
+        sender = FlakySender(failures_before_success={1: 2})
+        clock = FakeClock()
+        messages = [(1, 'a1'), (1, 'a2')]
+        with self.make_delivery(sender, clock) as delivery:
+            assert delivery.deliver(messages) == ([], messages)
+
+            clock.now = 1
+            assert delivery.deliver(messages) == ([], messages)
+
+            clock.now = 2
+            delivered, pending = delivery.deliver(messages)
+            assert delivered == [], 'Задержка должна расти экспоненциально'
+
+            clock.now = 3
+            delivered, pending = delivery.deliver(messages)
+
+        assert sender.sent == messages
+        assert delivered == messages
+        assert pending == []
+
+    def test_chat_in_backoff_is_skipped_until_retry_time(self):
+        sender = FlakySender(broken_chats={1})
+        clock = FakeClock()
+        with self.make_delivery(sender, clock) as delivery:
+            delivery.deliver([(1, 'a1')])
+            sender.broken_chats.clear()
+
+            delivered, pending = delivery.deliver([(1, 'a1')])
+            assert delivered == [] and pending == [(1, 'a1')]
+
+            clock.now = 1
+            delivered, pending = delivery.deliver([(1, 'a1')])
+            assert delivered == [(1, 'a1')] and pending == []
+
+    def test_recovered_chat_releases_other_chats_from_backoff(self):
+        sender = FlakySender(broken_chats={1, 2})
+        clock = FakeClock()
+        with self.make_delivery(sender, clock) as delivery:
+            delivery.deliver([(1, 'a1'), (2, 'b1')])
+            clock.now = 1
+            delivery.deliver([(2, 'b1')])
+            assert delivery.next_retry([1, 2]) == 1
+
+            sender.broken_chats.clear()
+            delivered, pending = delivery.deliver([(1, 'a1'), (2, 'b1')])
+            assert delivered == [(1, 'a1')] and pending == [(2, 'b1')]
+            assert delivery.next_retry([2]) == 1, (
+                'Восстановление чата должно снимать задержку с остальных'
+            )
+            assert delivery.deliver([(2, 'b1')]) == ([(2, 'b1')], [])
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from exceptions import APIResponseError
+from fetcher import FanOutFetcher
+
+
+class ConcurrencyProbe:
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.active_tokens = set()
+        self.token_overlap = False
+
+    def __call__(self, from_date, headers):
+        token = headers['Authorization'].split()[-1]
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.token_overlap |= token in self.active_tokens
+            self.active_tokens.add(token)
+        time.sleep(self.delays.get(token, 0.01))
+        with self.lock:
+            self.active -= 1
+            self.active_tokens.discard(token)
+        if token == 'broken':
+            raise APIResponseError('Неожиданный статус ответа')
+        return {'homeworks': [], 'current_date': from_date}
+
+
+class StreamProbe(ConcurrencyProbe):
+
+    def __call__(self, from_date, headers):
+        token = headers['Authorization'].split()[-1]
+        return self.stream(token)
+
+    def stream(self, token):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        for item in range(3):
+            time.sleep(0.01)
+            yield token, item
+        with self.lock:
+            self.active -= 1
+
+
+class TestFanOutFetcher:
+
+    def test_fetch_streams_results_as_completed(self):
+        probe = ConcurrencyProbe({'slow': 0.2, 'fast': 0.01})
+        with FanOutFetcher(probe, max_workers=4) as fetcher:
+            results = fetcher.fetch([('slow', 1), ('fast', 2)])
+            first = next(results)
+            assert first.token == 'fast', (
+                'Результаты должны отдаваться по мере готовности'
+            )
+            assert first.response == {'homeworks': [], 'current_date': 2}
+            assert next(results).token == 'slow'
+
+    def test_fetch_returns_errors_per_token(self):
+        probe = ConcurrencyProbe({})
+        with FanOutFetcher(probe) as fetcher:
+            results = {r.token: r for r in fetcher.fetch(
+                [('broken', 1), ('ok', 1)]
+            )}
+        assert isinstance(results['broken'].error, APIResponseError)
+        assert results['ok'].error is None
+
+    def test_fetch_respects_concurrency_caps(self):
+        probe = ConcurrencyProbe({})
+        batch = [(f'token{i % 3}', i) for i in range(12)]
+        with FanOutFetcher(probe, max_workers=8,
+                           max_per_host=2) as fetcher:
+            results = list(fetcher.fetch(batch))
+        assert len(results) == len(batch)
+        assert probe.max_active <= 2, 'Превышено ограничение на хост'
+        assert not probe.token_overlap, 'Превышено ограничение на токен'
+
+    def test_cycle_time_does_not_grow_with_subscribers(self):
+        probe = ConcurrencyProbe({f'token{i}': 0.1 for i in range(8)})
+        batch = [(f'token{i}', 0) for i in range(8)]
+        started = time.monotonic()
+        with FanOutFetcher(probe, max_workers=8, max_per_host=8) as fetcher:
+            list(fetcher.fetch(batch))
+        assert time.monotonic() - started < 0.5
+
+    def test_consume_runs_while_limits_are_held(self):
+        probe = StreamProbe({})
+        batch = [(f'token{i}', 0) for i in range(4)]
+        with FanOutFetcher(probe, max_workers=4, max_per_host=1) as fetcher:
+            results = list(fetcher.fetch(
+                batch, consume=lambda token, response: list(response)
+            ))
+
+        assert probe.max_active == 1, (
+            'Потоковый ответ должен читаться до освобождения ограничений'
+        )
+        assert {r.token: r.response for r in results}['token0'] == [
+            ('token0', 0), ('token0', 1), ('token0', 2)
+        ]
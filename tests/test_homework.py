@@ -0,0 +1,106 @@
+import pytest
+
+from backlog import NotificationBacklog
+from config import load_config
+from delivery import ChatDelivery
+from exceptions import SendMessageError
+from homework import poll_loop
+from scheduler import TimingWheel
+from subscriptions import TokenUpdate
+from utils import FakeClock
+
+CONFIG = load_config({
+    'PRACTICUM_TOKEN': 'sometoken',
+    'TELEGRAM_TOKEN': '1234:abcdefg',
+    'TELEGRAM_CHAT_ID': '12345',
+})
+
+
+class StopLoop(Exception):
+    pass
+
+
+class FakeHub:
+
+    def __init__(self, updates):
+        self.updates = updates
+        self.polls = []
+
+    def poll(self, tokens):
+        self.polls.append(list(tokens))
+        for token in tokens:
+            yield from self.updates.pop(token, ())
+
+
+class OutageSender:
+
+    def __init__(self, clock, down_until):
+        self.clock = clock
+        self.down_until = down_until
+        self.sent = []
+
+    def __call__(self, chat_id, text):
+        if self.clock() < self.down_until:
+            raise SendMessageError('Telegram недоступен')
+        self.sent.append((self.clock(), chat_id, text))
+
+
+def run_loop(clock, hub, sender, backlog, until, backoff=1, polls=None):
+    scheduler = TimingWheel(600, 1, clock=clock)
+    for token, deadline in (polls or {'student': clock()}).items():
+        scheduler.schedule(token, deadline)
+
+    def sleep(delay):
+        if clock() + delay > until:
+            raise StopLoop
+        clock.sleep(delay)
+
+    with ChatDelivery(sender, backoff=backoff, clock=clock) as delivery:
+        with pytest.raises(StopLoop):
+            poll_loop(hub, scheduler, delivery, backlog, {}, CONFIG, sleep)
+
+
+class TestPollLoop:
+
+    def test_retry_goes_out_before_next_poll(self):
+        clock = FakeClock(1000.0)
+        hub = FakeHub({'student': [
+            TokenUpdate('student', (1,), (('hw1', 'hw1 проверена'),), None)
+        ]})
+        sender = OutageSender(clock, down_until=1001)
+        backlog = NotificationBacklog()
+
+        run_loop(clock, hub, sender, backlog, until=1500)
+
+        assert sender.sent == [(1001, 1, 'hw1 проверена')], (
+            'Повторная отправка должна выполняться по задержке, '
+            'а не при следующем опросе'
+        )
+        assert len(backlog) == 0
+        assert hub.polls[0] == ['student']
+        assert not any(hub.polls[1:]), 'Лишних опросов быть не должно'
+
+    def test_backlog_drains_right_after_outage(self):
+        clock = FakeClock(1000.0)
+        hub = FakeHub({
+            'student': [TokenUpdate('student', (1,), (
+                ('hw1', 'hw1 проверена'), ('hw2', 'hw2 проверена'),
+            ), None)],
+            'other': [TokenUpdate('other', (2,), (
+                ('hw3', 'hw3 проверена'),
+            ), None)],
+        })
+        sender = OutageSender(clock, down_until=1040)
+        backlog = NotificationBacklog()
+
+        run_loop(clock, hub, sender, backlog, until=1500, backoff=5,
+                 polls={'student': 1000, 'other': 1010})
+
+        assert [(chat_id, text) for _, chat_id, text in sender.sent] == [
+            (2, 'hw3 проверена'), (1, 'hw1 проверена'), (1, 'hw2 проверена'),
+        ]
+        assert {moment for moment, _, _ in sender.sent} == {1045}, (
+            'Очередь должна разбираться сразу после восстановления '
+            'Telegram, а не по задержке каждого чата'
+        )
+        assert len(backlog) == 0
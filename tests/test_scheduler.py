@@ -0,0 +1,58 @@
+from scheduler import TimingWheel
+from utils import FakeClock
+
+
+class TestTimingWheel:
+
+    def test_spread_distributes_polls_evenly(self):
+        clock = FakeClock(1000.0)
+        wheel = TimingWheel(interval=600, tick=1, clock=clock)
+        wheel.spread(range(4))
+
+        assert [wheel.deadline(key) for key in range(4)] == [
+            1000.0, 1150.0, 1300.0, 1450.0
+        ], 'Опросы должны равномерно распределяться по интервалу'
+
+    def test_wait_due_wakes_only_when_work_is_due(self):
+        clock = FakeClock(1000.0)
+        wheel = TimingWheel(interval=600, tick=1, clock=clock)
+        wheel.spread(['a', 'b'], start=1010)
+
+        assert wheel.wait_due(sleep=clock.sleep) == ['a']
+        assert clock.now == 1010
+        assert wheel.wait_due(sleep=clock.sleep) == ['b']
+        assert clock.now == 1310
+        assert wheel.wait_due(sleep=clock.sleep) == []
+
+    def test_wait_due_wakes_early_for_wake_at(self):
+        clock = FakeClock(1000.0)
+        wheel = TimingWheel(interval=600, tick=1, clock=clock)
+        wheel.schedule('a', 1600)
+
+        assert wheel.wait_due(sleep=clock.sleep, wake_at=1005) == []
+        assert clock.now == 1005
+        assert wheel.wait_due(sleep=clock.sleep, wake_at=1700) == ['a']
+        assert clock.now == 1600
+
+    def test_reschedule_moves_deadline(self):
+        clock = FakeClock(1000.0)
+        wheel = TimingWheel(interval=600, tick=1, clock=clock)
+        wheel.schedule('a', 1005)
+        wheel.defer('a')
+
+        assert wheel.pop_due(1100) == []
+        assert wheel.next_deadline() == 1600
+        assert wheel.pop_due(1600) == ['a']
+        assert 'a' not in wheel
+
+    def test_overdue_and_far_deadlines(self):
+        clock = FakeClock(1000.0)
+        wheel = TimingWheel(interval=10, tick=1, clock=clock)
+        wheel.pop_due()
+        wheel.schedule('overdue', 900)
+        wheel.schedule('far', 1025)
+
+        assert wheel.pop_due() == ['overdue']
+        assert wheel.pop_due(1015) == []
+        assert wheel.next_deadline() == 1025
+        assert wheel.pop_due(1030) == ['far']
@@ -0,0 +1,82 @@
+from state import HomeworkStates, rss_bytes
+
+
+def cold_tier_size(tmp_path):
+    return sum(path.stat().st_size for path in tmp_path.glob('cold*'))
+
+
+class TestHomeworkStates:
+
+    def test_terminal_entries_move_to_cold_tier(self, tmp_path):
+        states = HomeworkStates(budget=0, cold_path=str(tmp_path / 'cold'))
+        states['hw1'] = 'approved'
+        states['hw2'] = 'reviewing'
+        states['hw3'] = 'rejected'
+
+        report = states.memory_report()
+        assert report['hot_entries'] == 2, (
+            'Нефинальные статусы должны оставаться в памяти'
+        )
+        assert report['cold_entries'] == 1
+        assert len(states) == 3
+        assert set(states) == {'hw1', 'hw2', 'hw3'}
+        assert states.get('hw1') == 'approved', (
+            'Вытесненная запись должна читаться из холодного хранилища'
+        )
+        assert states.memory_report()['hot_entries'] == 2
+        assert 'hw1' in states
+        assert states.get('missing') is None
+
+    def test_lru_order_within_budget(self, tmp_path):
+        states = HomeworkStates(budget=0, cold_path=str(tmp_path / 'cold'))
+        states._budget = 2 * HomeworkStates._entry_size('hw0', 'approved')
+        for i in range(3):
+            states[f'hw{i}'] = 'approved'
+
+        assert list(states._hot) == ['hw1', 'hw2'], (
+            'Вытесняться должна давно не использованная запись'
+        )
+        states['hw0'] = 'reviewing'
+        assert 'hw0' in states._hot
+        assert states['hw0'] == 'reviewing'
+        assert len(states) == 3
+
+    def test_cold_reads_do_not_rewrite_cold_tier(self, tmp_path):
+        states = HomeworkStates(budget=0, cold_path=str(tmp_path / 'cold'))
+        for i in range(100):
+            states[f'hw{i}'] = 'approved'
+        size = cold_tier_size(tmp_path)
+
+        for _ in range(10):
+            for i in range(100):
+                assert states[f'hw{i}'] == 'approved'
+                states[f'hw{i}'] = 'approved'
+
+        assert cold_tier_size(tmp_path) == size, (
+            'Чтение и запись того же статуса не должны переписывать диск'
+        )
+        assert states.memory_report()['cold_entries'] == 100
+
+        states['hw0'] = 'reviewing'
+        assert states.memory_report()['cold_entries'] == 99
+        assert states['hw0'] == 'reviewing'
+
+    def test_cold_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'cold')
+        states = HomeworkStates(budget=0, cold_path=path)
+        states['hw1'] = 'approved'
+        states.close()
+
+        assert HomeworkStates(budget=0, cold_path=path)['hw1'] == 'approved'
+
+    def test_without_cold_path_nothing_is_evicted(self):
+        states = HomeworkStates(budget=0)
+        states['hw1'] = 'approved'
+        del states['hw1']
+        states['hw2'] = 'approved'
+
+        assert dict(states) == {'hw2': 'approved'}
+        assert states.memory_report()['cold_entries'] == 0
+
+    def test_rss_bytes(self):
+        assert rss_bytes() > 0
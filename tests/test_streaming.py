@@ -0,0 +1,128 @@
+import json
+import tracemalloc
+from http import HTTPStatus
+
+import pytest
+import requests
+
+from exceptions import APIResponseError, JSONDataStructureError
+from streaming import decode_chunks, iter_homeworks
+
+HOMEWORK = {
+    'id': 1,
+    'status': 'approved',
+    'homework_name': 'Тестовая работа',
+    'reviewer_comment': 'Всё нравится',
+    'date_updated': '2020-02-13T14:40:57Z',
+    'lesson_name': 'Итоговый проект',
+}
+
+
+def chunked(text, size):
+    data = text.encode()
+    return decode_chunks(data[i:i + size] for i in range(0, len(data), size))
+
+
+def lazy_response_chunks(count):
+    yield b'{"current_date": 1581604857, "homeworks": ['
+    for i in range(count):
+        separator = b',' if i else b''
+        yield separator + json.dumps(
+            {**HOMEWORK, 'id': i}, ensure_ascii=False
+        ).encode()
+    yield b']}'
+
+
+def stream_peak(count):
+    tracemalloc.start()
+    for _ in iter_homeworks(decode_chunks(lazy_response_chunks(count))):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+class MockStreamResponse:
+
+    def __init__(self, body, status_code=HTTPStatus.OK):
+        self.body = body
+        self.status_code = status_code
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TestStreaming:
+
+    @pytest.mark.parametrize('size', [1, 7, 4096])
+    def test_iter_homeworks_matches_json(self, size):
+        data = {
+            'homeworks': [{**HOMEWORK, 'id': i} for i in range(5)],
+            'current_date': 1581604857,
+            'nested': {'list': [1, 2.5, None, True]},
+        }
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+
+        assert list(iter_homeworks(chunked(text, size))) == data['homeworks']
+
+    @pytest.mark.parametrize('text, error', [
+        ('[{"homeworks": []}]', TypeError),
+        ('{"current_date": 1}', JSONDataStructureError),
+        ('{"homeworks": {"status": "approved"}}', JSONDataStructureError),
+        ('{"homeworks": []}', JSONDataStructureError),
+        ('{"homeworks": [1]}', JSONDataStructureError),
+        ('{"homeworks": [{"status": "appr', JSONDataStructureError),
+    ])
+    def test_iter_homeworks_validation(self, text, error):
+        with pytest.raises(error):
+            list(iter_homeworks(chunked(text, 3)))
+
+    def test_peak_memory_does_not_grow_with_history(self):
+        small, large = stream_peak(500), stream_peak(10_000)
+        assert large < small * 2, (
+            'Пиковая память потокового разбора не должна зависеть '
+            'от числа домашних работ'
+        )
+
+    def test_stream_api_answer(self, monkeypatch):
+        body = json.dumps(
+            {'homeworks': [HOMEWORK], 'current_date': 1}, ensure_ascii=False
+        ).encode()
+        response = MockStreamResponse(body)
+
+        def mock_get(url, headers=None, params=None, stream=False,
+                     timeout=None):
+            assert stream, 'Ответ должен запрашиваться потоком'
+            assert timeout, 'Запрос к сервису должен ограничиваться таймаутом'
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+
+        import homework
+
+        homeworks = homework.stream_api_answer(1, {}, chunk_size=5)
+        assert list(homeworks) == [HOMEWORK]
+        assert response.closed
+
+    def test_stream_api_answer_bad_status(self, monkeypatch):
+        response = MockStreamResponse(
+            b'', status_code=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        monkeypatch.setattr(requests, 'get', lambda *args, **kwargs: response)
+
+        import homework
+
+        with pytest.raises(APIResponseError):
+            homework.stream_api_answer(1, {})
+        assert response.closed
@@ -0,0 +1,132 @@
+import threading
+
+from fetcher import FanOutFetcher, FetchResult
+from settings import NO_NAME_HOME_WORK
+from subscriptions import SubscriptionHub
+from utils import FakeClock
+
+
+class MockFetcher:
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def fetch(self, batch, consume):
+        for token, from_date in batch:
+            self.calls.append(token)
+            response = self.responses[token]
+            if isinstance(response, Exception):
+                yield FetchResult(token, from_date, None, response)
+            else:
+                yield FetchResult(
+                    token, from_date, consume(token, response), None
+                )
+
+
+def diff_status(homework, states):
+    if states.get(homework['homework_name']) == homework['status']:
+        return None
+    states[homework['homework_name']] = homework['status']
+    return f'{homework["homework_name"]}: {homework["status"]}'
+
+
+def make_hub(responses, clock):
+    fetcher = MockFetcher(responses)
+    hub = SubscriptionHub(
+        fetcher, lambda response: response['homeworks'], diff_status,
+        lambda homework: homework['date'], interval=600, clock=clock,
+    )
+    return hub, fetcher
+
+
+class TestSubscriptionHub:
+    HOMEWORK = {'homework_name': 'hw1', 'status': 'reviewing', 'date': 10}
+
+    def test_one_fetch_serves_all_chats_of_token(self):
+        clock = FakeClock()
+        hub, fetcher = make_hub({
+            'student': {'homeworks': [self.HOMEWORK]},
+            'other': {'homeworks': []},
+        }, clock)
+        hub.subscribe('student', 1)
+        hub.subscribe('student', 2)
+        hub.subscribe('student', 2)
+        hub.subscribe('other', 3)
+
+        updates = {update.token: update for update in hub.poll()}
+
+        assert sorted(fetcher.calls) == ['other', 'student'], (
+            'Запросов к сервису должно быть по одному на токен'
+        )
+        assert updates['student'].chat_ids == (1, 2)
+        assert updates['student'].changes == (('hw1', 'hw1: reviewing'),)
+        assert updates['other'].changes == ()
+
+    def test_missing_homework_name_uses_default_key(self):
+        homework = {'homework_name': None, 'status': 'approved', 'date': 10}
+        hub, _ = make_hub({'student': {'homeworks': [homework]}}, FakeClock())
+        hub.subscribe('student', 1)
+
+        update, = hub.poll()
+        assert update.changes[0][0] == NO_NAME_HOME_WORK, (
+            'Ключ уведомления должен совпадать с именем из diff_status'
+        )
+
+    def test_result_is_cached_for_poll_interval(self):
+        clock = FakeClock()
+        hub, fetcher = make_hub(
+            {'student': {'homeworks': [self.HOMEWORK]}}, clock
+        )
+        hub.subscribe('student', 1)
+        first = list(hub.poll())
+
+        clock.now = 599
+        assert list(hub.poll()) == []
+        assert hub.latest('student') == first[0]
+        assert fetcher.calls == ['student']
+
+        clock.now = 600
+        second = list(hub.poll())
+        assert fetcher.calls == ['student', 'student']
+        assert second[0].changes == (), 'Статус не изменился'
+
+    def test_errors_are_shared_by_subscribers(self):
+        clock = FakeClock()
+        error = ValueError('boom')
+        hub, _ = make_hub({'student': error}, clock)
+        hub.subscribe('student', 1)
+        hub.subscribe('student', 2)
+
+        update, = hub.poll()
+        assert update.error is error
+        assert update.chat_ids == (1, 2)
+
+    def test_unsubscribe_last_chat_stops_polling(self):
+        clock = FakeClock()
+        hub, fetcher = make_hub({'student': {'homeworks': []}}, clock)
+        hub.subscribe('student', 1)
+        hub.unsubscribe('student', 1)
+
+        assert hub.tokens() == []
+        assert list(hub.poll(['student'])) == []
+        assert fetcher.calls == []
+
+    def test_streamed_response_is_read_in_fetcher_thread(self):
+        threads = []
+
+        def stream_api_answer(from_date, headers):
+            threads.append(threading.current_thread().name)
+            yield self.HOMEWORK
+
+        with FanOutFetcher(stream_api_answer) as fetcher:
+            hub = SubscriptionHub(
+                fetcher, iter, diff_status, lambda homework: homework['date']
+            )
+            hub.subscribe('student', 1)
+            update, = hub.poll()
+
+        assert update.changes == (('hw1', 'hw1: reviewing'),)
+        assert threads[0].startswith('fetcher'), (
+            'Потоковый ответ должен читаться в потоке запроса'
+        )
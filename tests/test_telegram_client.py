@@ -0,0 +1,61 @@
+import json
+
+import pytest
+import urllib3
+
+from exceptions import SendMessageError
+from telegram_client import TelegramClient
+
+
+class MockPoolResponse:
+
+    def __init__(self, data, status=200):
+        self.data = json.dumps(data).encode()
+        self.status = status
+
+
+class TestTelegramClient:
+    TOKEN = '1234:abcdefg'
+
+    def test_send_message(self, monkeypatch):
+        client = TelegramClient(self.TOKEN)
+        sent = {}
+
+        def mock_urlopen(method, path, body=None, **kwargs):
+            sent.update(method=method, path=path, body=json.loads(body))
+            return MockPoolResponse({'ok': True, 'result': {'message_id': 1}})
+
+        monkeypatch.setattr(client._pool, 'urlopen', mock_urlopen)
+
+        result = client.send_message(12345, 'text')
+        assert result == {'message_id': 1}, (
+            'Проверьте, что `send_message` возвращает `result` ответа API'
+        )
+        assert sent['path'] == f'/bot{self.TOKEN}/sendMessage'
+        assert sent['body'] == {'chat_id': 12345, 'text': 'text'}
+
+    def test_send_message_api_error(self, monkeypatch):
+        client = TelegramClient(self.TOKEN)
+        monkeypatch.setattr(
+            client._pool, 'urlopen',
+            lambda *args, **kwargs: MockPoolResponse(
+                {'ok': False, 'error_code': 400, 'description': 'Bad'}, 400
+            )
+        )
+
+        with pytest.raises(SendMessageError):
+            client.send_message(12345, 'text')
+
+    def test_send_message_network_error_hides_token(self, monkeypatch):
+        client = TelegramClient(self.TOKEN)
+
+        def mock_urlopen(method, path, **kwargs):
+            raise urllib3.exceptions.HTTPError(f'connection lost: {path}')
+
+        monkeypatch.setattr(client._pool, 'urlopen', mock_urlopen)
+
+        with pytest.raises(SendMessageError) as e:
+            client.send_message(12345, 'text')
+        assert self.TOKEN not in str(e.value), (
+            'Токен бота не должен попадать в текст ошибки'
+        )
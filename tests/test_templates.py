@@ -0,0 +1,56 @@
+import pytest
+
+from exceptions import APIResponseError, JSONDataStructureError
+from settings import HOMEWORK_STATUSES
+from templates import (COMPILED_STATUS_TEMPLATES, compile_status_templates,
+                       render_error, render_status)
+
+
+class TestTemplates:
+
+    @pytest.mark.parametrize('status', list(HOMEWORK_STATUSES))
+    def test_render_status_matches_legacy_message(self, status):
+        name = 'hw_"name"_<1>'
+        expected = (
+            f'Изменился статус проверки работы "{name}". '
+            f'{HOMEWORK_STATUSES[status]}'
+        )
+        assert render_status(name, status).encode() == expected.encode(), (
+            'Сообщение на русском должно совпадать с прежним побайтно'
+        )
+
+    def test_render_status_html_escapes_name_only(self):
+        result = render_status('<hw & 1>', 'approved', parse_mode='HTML')
+        assert result == (
+            'Изменился статус проверки работы "<b>&lt;hw &amp; 1&gt;</b>". '
+            f'{HOMEWORK_STATUSES["approved"]}'
+        )
+
+    def test_render_status_markdown_escapes_static_parts(self):
+        result = render_status('hw_1', 'reviewing', parse_mode='MarkdownV2')
+        assert result == (
+            'Изменился статус проверки работы "*hw\\_1*"\\. '
+            'Работа взята на проверку ревьюером\\.'
+        )
+
+    def test_render_status_locale(self):
+        assert render_status('hw', 'rejected', locale='en') == (
+            'Homework "hw" review status changed. '
+            'Homework reviewed: the reviewer has some remarks.'
+        )
+
+    def test_static_parts_are_interned(self):
+        template = COMPILED_STATUS_TEMPLATES['approved', 'ru', None]
+        fresh = compile_status_templates()['approved', 'ru', None]
+        assert fresh.head is template.head
+        assert fresh.tail is template.tail
+
+    @pytest.mark.parametrize('error, expected', [
+        (APIResponseError('timeout'), 'Ошибка ответа от сервиса: timeout'),
+        (JSONDataStructureError('пусто'), 'Ошибка данных JSON: пусто'),
+        (KeyError('status'), "Ошибка ключей словаря: 'status'"),
+        (TypeError('list'), 'Ошибка типа данных: list'),
+        (ValueError('boom'), 'Сбой в работе программы: boom'),
+    ])
+    def test_render_error_matches_legacy_message(self, error, expected):
+        assert render_error(error) == expected
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from exceptions import APIResponseError
+from tracing import TraceRecorder, load_trace, main, replay
+
+
+class MockBot:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class TestTracing:
+    TOKEN = 'secret-token'
+
+    def test_recorder_scrubs_tokens(self, tmp_path):
+        path = tmp_path / 'trace.jsonl'
+
+        def api_answer(current_timestamp):
+            if current_timestamp == 2:
+                raise APIResponseError(f'OAuth {self.TOKEN} отклонен')
+            return {'homeworks': [], 'current_date': current_timestamp}
+
+        bot = MockBot()
+        with TraceRecorder(path, secrets=(self.TOKEN,)) as recorder:
+            recorded = recorder.wrap_api(api_answer)
+            recorded(1)
+            with pytest.raises(APIResponseError):
+                recorded(2)
+            recorder.wrap_bot(bot).send_message(42, 'text')
+
+        assert self.TOKEN not in path.read_text(encoding='utf-8'), (
+            'Токены не должны попадать в трассу'
+        )
+        entries = load_trace(path)
+        assert [entry['kind'] for entry in entries] == ['api', 'api', 'send']
+        assert entries[0]['response']['current_date'] == 1
+        assert entries[1]['error'] == 'OAuth *** отклонен'
+        assert bot.sent == [(42, 'text')]
+
+    def test_replay_reports_stats(self, tmp_path):
+        path = tmp_path / 'trace.jsonl'
+        lines = [
+            {'kind': 'api', 'response': {'homeworks': [
+                {'homework_name': 'hw1', 'status': 'reviewing'},
+                {'homework_name': 'hw2', 'status': 'unknown'},
+            ]}},
+            {'kind': 'api', 'response': {'homeworks': []}},
+            {'kind': 'api', 'error': 'timeout'},
+            {'kind': 'send', 'chat_id': 1, 'text': 'hw1'},
+        ]
+        path.write_text(
+            '\n'.join(json.dumps(line) for line in lines), encoding='utf-8'
+        )
+
+        def parse_status(homework):
+            if homework['status'] == 'unknown':
+                raise KeyError('status')
+            return homework['homework_name']
+
+        def check_response(response):
+            if not response['homeworks']:
+                raise TypeError('пусто')
+            return response['homeworks']
+
+        delivered = []
+        stats = replay(
+            load_trace(path), check_response, parse_status, delivered.append
+        )
+
+        assert delivered == ['hw1']
+        assert stats['responses'] == 2
+        assert stats['recorded_sends'] == 1
+        assert stats['homeworks'] == 2
+        assert stats['messages'] == 1
+        assert stats['errors'] == 2
+        assert stats['peak_bytes'] >= 0
+
+    def test_main_replays_through_send_chat_message(self, tmp_path, capsys):
+        path = tmp_path / 'trace.jsonl'
+        homeworks = [
+            {'homework_name': f'hw{i}', 'status': 'approved'}
+            for i in range(50)
+        ]
+        path.write_text(json.dumps(
+            {'kind': 'api', 'response': {'homeworks': homeworks}}
+        ), encoding='utf-8')
+
+        main(path)
+
+        output = dict(
+            line.split() for line in capsys.readouterr().out.splitlines()
+        )
+        assert output['messages'] == '50'
+        assert int(output['allocated_blocks']) >= 50, (
+            'Доставленные сообщения должны учитываться в выделениях'
+        )
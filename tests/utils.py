@@ -37,3 +37,15 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+class FakeClock:
+    """Manually advanced clock; `sleep` moves time forward instantly"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float) -> None:
+        self.now += delay
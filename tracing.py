@@ -0,0 +1,195 @@
+"""Запись и воспроизведение трасс работы бота.
+
+Воспроизведение трассы из корня проекта:
+
+    python tracing.py trace.jsonl
+"""
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from functools import partial
+
+from exceptions import JSONDataStructureError
+
+SCRUBBED = '***'
+REPLAY_CHAT_ID = 0
+
+
+class TraceRecorder:
+    """Пишет ответы сервиса и отправленные сообщения в JSONL-трассу.
+
+    Значения секретов (токенов) заменяются на `***` перед записью.
+    """
+
+    def __init__(self, path, secrets=()):
+        self._file = open(path, 'a', encoding='utf-8')
+        self._secrets = [str(secret) for secret in secrets if secret]
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Закрывает файл трассы."""
+        self._file.close()
+
+    def _scrub(self, text):
+        for secret in self._secrets:
+            text = text.replace(secret, SCRUBBED)
+        return text
+
+    def record(self, kind, **fields):
+        """Добавляет в трассу запись заданного вида."""
+        line = json.dumps(
+            {'kind': kind, 'time': time.time(), **fields}, ensure_ascii=False
+        )
+        with self._lock:
+            self._file.write(self._scrub(line) + '\n')
+            self._file.flush()
+
+    def wrap_api(self, get_api_answer):
+        """Оборачивает `get_api_answer`, записывая ответы и ошибки."""
+        def recorded_api_answer(current_timestamp, *args):
+            try:
+                response = get_api_answer(current_timestamp, *args)
+            except Exception as e:
+                self.record('api', from_date=current_timestamp, error=str(e))
+                raise
+            self.record('api', from_date=current_timestamp, response=response)
+            return response
+
+        return recorded_api_answer
+
+    def wrap_bot(self, bot):
+        """Оборачивает бота, записывая успешно отправленные сообщения."""
+        return RecordingBot(bot, self)
+
+
+class RecordingBot:
+    """Бот-обертка, записывающая отправленные сообщения в трассу."""
+
+    def __init__(self, bot, recorder):
+        self._bot = bot
+        self._recorder = recorder
+
+    def send_message(self, chat_id, text, **kwargs):
+        """Отправляет сообщение и записывает его в трассу."""
+        result = self._bot.send_message(chat_id, text, **kwargs)
+        self._recorder.record('send', chat_id=chat_id, text=text)
+        return result
+
+
+class ReplayBot:
+    """Бот-заглушка для воспроизведения: хранит сообщения вместо отправки."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text, **kwargs):
+        """Запоминает сообщение."""
+        self.sent.append((chat_id, text))
+
+
+def count_allocations(before, after):
+    """Считает блоки и байты, выделенные между снимками tracemalloc.
+
+    Учитываются выделения, живые на момент второго снимка, по местам
+    выделения; освобождение старых объектов их не уменьшает.
+    """
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), 'traceback'
+    )
+    return (sum(max(stat.count_diff, 0) for stat in stats),
+            sum(max(stat.size_diff, 0) for stat in stats))
+
+
+def load_trace(path):
+    """Читает записи трассы из JSONL-файла."""
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def replay(entries, check_response, parse_status, deliver):
+    """Прогоняет ответы из трассы через проверку, разбор и доставку.
+
+    Возвращает статистику: число записей, сообщений и ошибок, время,
+    пропускную способность, пиковую память и выделения за прогон, еще
+    живые в конце (сохраненные статусы и доставленные сообщения).
+    """
+    responses = [entry for entry in entries
+                 if entry.get('kind') == 'api' and 'response' in entry]
+    stats = {
+        'responses': len(responses),
+        'recorded_sends': sum(
+            1 for entry in entries if entry.get('kind') == 'send'
+        ),
+        'homeworks': 0,
+        'messages': 0,
+        'errors': 0,
+    }
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    started = time.perf_counter()
+    for entry in responses:
+        try:
+            homeworks = check_response(entry['response'])
+        except (JSONDataStructureError, TypeError):
+            stats['errors'] += 1
+            continue
+        for homework in homeworks:
+            stats['homeworks'] += 1
+            try:
+                message = parse_status(homework)
+            except KeyError:
+                stats['errors'] += 1
+                continue
+            if message:
+                deliver(message)
+                stats['messages'] += 1
+    elapsed = time.perf_counter() - started
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocated_blocks, allocated_bytes = count_allocations(before, after)
+    stats.update(
+        seconds=elapsed,
+        responses_per_second=len(responses) / elapsed if elapsed else 0.0,
+        messages_per_second=stats['messages'] / elapsed if elapsed else 0.0,
+        allocated_blocks=allocated_blocks,
+        allocated_bytes=allocated_bytes,
+        peak_bytes=peak,
+    )
+    return stats
+
+
+def main(path):
+    """Воспроизводит трассу на чистом состоянии и печатает статистику.
+
+    Сообщения проходят через `send_chat_message` к боту-заглушке.
+    """
+    import homework
+    from settings import STATE_MEMORY_BUDGET
+    from state import HomeworkStates
+
+    # Воспроизведение не трогает холодное хранилище рабочего бота.
+    states = HomeworkStates(STATE_MEMORY_BUDGET)
+    stats = replay(
+        load_trace(path), homework.check_response,
+        partial(homework.diff_status, states=states),
+        partial(homework.send_chat_message, ReplayBot(), REPLAY_CHAT_ID),
+    )
+    for key, value in stats.items():
+        print(f'{key:<22}{value:>16.6g}' if isinstance(value, float)
+              else f'{key:<22}{value:>16}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])